@@ -1,19 +1,28 @@
+import asyncio
+import functools
+import hashlib
 import json
 import logging
 import os
 import re
+import socket
 import subprocess
 import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 
 import cv2
 import numpy as np
 import redis
 import requests
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 from ultralytics import YOLO
 
 try:
@@ -38,13 +47,70 @@ INTERNAL_API_KEY = os.getenv("INTERNAL_API_KEY", "internal-secret-123")
 
 MODEL_PATH = os.getenv("MODEL_PATH", "/app/models/trained/traffic_model_v1.pt")
 MODEL_FALLBACK = os.getenv("MODEL_FALLBACK", "yolov8n.pt")
+MODELS_DIR = Path(os.getenv("MODELS_DIR", "/app/models"))
+MODEL_WARMUP_PASSES = int(os.getenv("MODEL_WARMUP_PASSES", "2"))
+MODEL_WARMUP_SIZE = int(os.getenv("MODEL_WARMUP_SIZE", "640"))
+MODEL_LOAD_MAX_ATTEMPTS = max(1, int(os.getenv("MODEL_LOAD_MAX_ATTEMPTS", "5")))
+MODEL_LOAD_RETRY_MAX_SECONDS = float(os.getenv("MODEL_LOAD_RETRY_MAX_SECONDS", "60"))
 
 DETECTION_CONFIDENCE = float(os.getenv("DETECTION_CONFIDENCE", "0.45"))
+# "split" runs detection on a downscaled copy and keeps full resolution for OCR and evidence;
+# "native" feeds the camera frame to the model as-is.
+PIPELINE_MODE = os.getenv("PIPELINE_MODE", "split").lower()
+DETECTION_MAX_SIDE = int(os.getenv("DETECTION_MAX_SIDE", "960"))
+HLS_MAX_SIDE = int(os.getenv("HLS_MAX_SIDE", "1280"))
+# Per-camera tiling, e.g. {"cam-4k-01": {"rows": 2, "cols": 3, "overlap": 0.2, "motionOnly": true}};
+# the "*" key applies to every camera without its own entry.
+try:
+    TILED_CAMERAS = json.loads(os.getenv("TILED_CAMERAS", "{}") or "{}")
+except ValueError as exc:
+    logger.warning("Ignoring TILED_CAMERAS, it is not valid JSON: %s", exc)
+    TILED_CAMERAS = {}
+if not isinstance(TILED_CAMERAS, dict):
+    logger.warning("Ignoring TILED_CAMERAS, expected an object keyed by camera id")
+    TILED_CAMERAS = {}
+TILE_NMS_IOU = float(os.getenv("TILE_NMS_IOU", "0.5"))
+TILE_NMS_CONTAINMENT = float(os.getenv("TILE_NMS_CONTAINMENT", "0.85"))
+TILE_MOTION_MIN_FRACTION = float(os.getenv("TILE_MOTION_MIN_FRACTION", "0.01"))
+TILE_MOTION_DOWNSCALE = int(os.getenv("TILE_MOTION_DOWNSCALE", "8"))
+PREVIEW_MAX_SIDE = int(os.getenv("PREVIEW_MAX_SIDE", "960"))
+PREVIEW_FPS = float(os.getenv("PREVIEW_FPS", "10"))
+PREVIEW_JPEG_QUALITY = int(os.getenv("PREVIEW_JPEG_QUALITY", "70"))
+DETECTION_CACHE_MAX_ENTRIES = int(os.getenv("DETECTION_CACHE_MAX_ENTRIES", "20000"))
+DETECTION_CACHE_PERSIST = os.getenv("DETECTION_CACHE_PERSIST", "false").lower() in ("1", "true", "yes")
+PLATE_DETECTION_CONFIDENCE = float(os.getenv("PLATE_DETECTION_CONFIDENCE", "0.25"))
+PLATE_CONTAINMENT_THRESHOLD = float(os.getenv("PLATE_CONTAINMENT_THRESHOLD", "0.7"))
+PLATE_CROP_PADDING = float(os.getenv("PLATE_CROP_PADDING", "0.08"))
+PLATE_MIN_WIDTH = int(os.getenv("PLATE_MIN_WIDTH", "48"))
+PLATE_MIN_HEIGHT = int(os.getenv("PLATE_MIN_HEIGHT", "14"))
+PLATE_MIN_SHARPNESS = float(os.getenv("PLATE_MIN_SHARPNESS", "60"))
+PLATE_MIN_CONTRAST = float(os.getenv("PLATE_MIN_CONTRAST", "20"))
+PLATE_TRACK_TTL_SECONDS = float(os.getenv("PLATE_TRACK_TTL_SECONDS", "10"))
+PLATE_TRACK_MIN_IOU = float(os.getenv("PLATE_TRACK_MIN_IOU", "0.3"))
+PLATE_TRACK_MAX_MISSES = int(os.getenv("PLATE_TRACK_MAX_MISSES", "2"))
 STREAM_FRAME_SKIP = int(os.getenv("STREAM_FRAME_SKIP", "3"))
 VIDEO_FRAME_SKIP = int(os.getenv("VIDEO_FRAME_SKIP", "5"))
 VIOLATION_COOLDOWN_SECONDS = int(os.getenv("VIOLATION_COOLDOWN_SECONDS", "12"))
 NO_PLATE_COOLDOWN_SECONDS = int(os.getenv("NO_PLATE_COOLDOWN_SECONDS", "8"))
 
+NODE_ID = os.getenv("NODE_ID", socket.gethostname())
+VIDEO_WORKER_COUNT = max(1, int(os.getenv("VIDEO_WORKER_COUNT", "2")))
+VIDEO_MAX_CONCURRENT_JOBS = max(1, int(os.getenv("VIDEO_MAX_CONCURRENT_JOBS", str(VIDEO_WORKER_COUNT))))
+VIDEO_MAX_LONG_JOBS = max(1, int(os.getenv("VIDEO_MAX_LONG_JOBS", str(max(1, VIDEO_WORKER_COUNT - 1)))))
+VIDEO_SHORT_CLIP_SECONDS = float(os.getenv("VIDEO_SHORT_CLIP_SECONDS", "120"))
+VIDEO_JOB_MAX_ATTEMPTS = int(os.getenv("VIDEO_JOB_MAX_ATTEMPTS", "3"))
+VIDEO_JOB_MAX_RECOVERIES = int(os.getenv("VIDEO_JOB_MAX_RECOVERIES", "5"))
+VIDEO_PROGRESS_INTERVAL_SECONDS = float(os.getenv("VIDEO_PROGRESS_INTERVAL_SECONDS", "5"))
+VIDEO_QUEUE_POLL_SECONDS = int(os.getenv("VIDEO_QUEUE_POLL_SECONDS", "5"))
+VIDEO_WORKER_HEARTBEAT_TTL_SECONDS = int(os.getenv("VIDEO_WORKER_HEARTBEAT_TTL_SECONDS", "60"))
+VIDEO_CHECKPOINT_INTERVAL_SECONDS = float(os.getenv("VIDEO_CHECKPOINT_INTERVAL_SECONDS", "15"))
+VIDEO_CHECKPOINT_TTL_SECONDS = int(os.getenv("VIDEO_CHECKPOINT_TTL_SECONDS", str(7 * 24 * 3600)))
+VIDEO_REPORT_BATCH_SIZE = max(1, int(os.getenv("VIDEO_REPORT_BATCH_SIZE", "25")))
+VIDEO_REPORT_FLUSH_SECONDS = float(os.getenv("VIDEO_REPORT_FLUSH_SECONDS", "5"))
+VIDEO_REPORT_MAX_RETRIES = max(1, int(os.getenv("VIDEO_REPORT_MAX_RETRIES", "5")))
+VIDEO_REPORT_RETRY_MAX_SECONDS = float(os.getenv("VIDEO_REPORT_RETRY_MAX_SECONDS", "30"))
+EVIDENCE_WRITER_THREADS = max(1, int(os.getenv("EVIDENCE_WRITER_THREADS", "2")))
+
 UPLOADS_DIR = Path("/app/uploads")
 EVIDENCE_DIR = UPLOADS_DIR / "evidence"
 SNAPSHOT_DIR = UPLOADS_DIR / "snapshots"
@@ -52,6 +118,16 @@ LIVE_DIR = UPLOADS_DIR / "live"
 
 REQUEST_HEADERS = {"x-api-key": INTERNAL_API_KEY}
 
+# Uploads land on the ingress queue and are ranked into one of the priority
+# queues below; workers always drain them in this order.
+VIDEO_INGRESS_QUEUE = "video:queue"
+VIDEO_PRIORITY_ORDER = ("urgent", "short", "long")
+VIDEO_PRIORITY_QUEUES = {priority: f"video:queue:{priority}" for priority in VIDEO_PRIORITY_ORDER}
+VIDEO_PROCESSING_PREFIX = "video:processing:"
+VIDEO_WORKER_ALIVE_PREFIX = "video:worker:alive:"
+VIDEO_REAPER_LOCK_KEY = "video:reaper:lock"
+VIDEO_CHECKPOINT_PREFIX = "video:checkpoint:"
+
 
 camera_threads: Dict[str, threading.Thread] = {}
 camera_stop_events: Dict[str, threading.Event] = {}
@@ -65,6 +141,17 @@ dedup_lock = threading.Lock()
 last_violation_sent: Dict[Tuple[str, str, str], float] = {}
 last_no_plate_violation_sent: Dict[Tuple[str, str], float] = {}
 
+# Vehicle tracks per camera or video job, each carrying the best plate read for that vehicle.
+plate_track_lock = threading.Lock()
+plate_tracks: Dict[str, List["PlateTrack"]] = {}
+ocr_stats: Dict[str, int] = defaultdict(int)
+
+# Video jobs share one keep-alive session for bulk reports and one pool for evidence encoding.
+backend_session = requests.Session()
+backend_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=max(4, VIDEO_WORKER_COUNT * 2)))
+backend_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=max(4, VIDEO_WORKER_COUNT * 2)))
+evidence_writer = ThreadPoolExecutor(max_workers=EVIDENCE_WRITER_THREADS, thread_name_prefix="evidence")
+
 
 VIOLATION_CLASS_MAP = {
     "red_light": "RED_LIGHT",
@@ -100,13 +187,96 @@ def ensure_upload_dirs() -> None:
         directory.mkdir(parents=True, exist_ok=True)
 
 
-def load_model() -> Tuple[YOLO, bool]:
-    model_path = MODEL_PATH if os.path.exists(MODEL_PATH) else MODEL_FALLBACK
-    using_custom_model = model_path == MODEL_PATH
+class Detection(NamedTuple):
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    class_name: str
+    confidence: float
+    violation_type: str
+    # License plate box matched inside this detection, when the model found one.
+    plate_box: Optional[Tuple[int, int, int, int]] = None
+
+    @property
+    def bbox(self) -> Tuple[int, int, int, int]:
+        return self.x1, self.y1, self.x2, self.y2
+
+
+@dataclass
+class PlateTrack:
+    bbox: Tuple[int, int, int, int]
+    class_name: str
+    # Processed frames in a row in which no detection was associated with this track.
+    misses: int = 0
+    # Quality of the best crop sent to OCR, its result, and when that read happened.
+    quality: float = 0.0
+    plate: Optional[str] = None
+    read_at: float = 0.0
+
+
+@dataclass
+class ModelHandle:
+    model: YOLO
+    version: str
+    path: str
+    using_custom_model: bool
+    # class id -> (class name, trackable, violation type, plate), resolved once per load instead of per box.
+    class_info: Dict[int, Tuple[str, bool, str, bool]]
+    loaded_at: float = field(default_factory=time.time)
+
+    def describe(self) -> dict:
+        return {
+            "version": self.version,
+            "path": self.path,
+            "usingCustomModel": self.using_custom_model,
+            "classes": len(self.class_info),
+            "loadedAt": self.loaded_at,
+        }
+
+
+def compute_model_version(model_path: str) -> str:
+    if not os.path.exists(model_path):
+        return Path(model_path).stem
+
+    digest = hashlib.sha1()
+    with open(model_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return f"{Path(model_path).stem}-{digest.hexdigest()[:10]}"
+
+
+def build_class_info(names: Dict[int, str]) -> Dict[int, Tuple[str, bool, str, bool]]:
+    class_info = {}
+    for class_id, raw_name in names.items():
+        class_name = str(raw_name).strip()
+        class_info[int(class_id)] = (
+            class_name,
+            is_trackable_class(class_name),
+            infer_violation_type(class_name),
+            is_plate_class(class_name),
+        )
+    return class_info
+
+
+def load_model_handle(model_path: str, version: Optional[str] = None) -> ModelHandle:
     logger.info("Loading YOLO model from %s", model_path)
     loaded = YOLO(model_path)
-    logger.info("Model loaded. using_custom_model=%s", using_custom_model)
-    return loaded, using_custom_model
+    warm_up_model(loaded)
+    handle = ModelHandle(
+        model=loaded,
+        version=version or compute_model_version(model_path),
+        path=model_path,
+        using_custom_model=model_path != MODEL_FALLBACK,
+        class_info=build_class_info(loaded.names),
+    )
+    logger.info("Model %s loaded. using_custom_model=%s", handle.version, handle.using_custom_model)
+    return handle
+
+
+def load_model() -> ModelHandle:
+    model_path = MODEL_PATH if os.path.exists(MODEL_PATH) else MODEL_FALLBACK
+    return load_model_handle(model_path, os.getenv("MODEL_VERSION") if model_path == MODEL_PATH else None)
 
 
 def init_ocr_reader():
@@ -123,8 +293,467 @@ def init_ocr_reader():
         return None
 
 
-MODEL, USING_CUSTOM_MODEL = load_model()
-OCR_READER = init_ocr_reader()
+def warm_up_model(model: YOLO) -> None:
+    # The first predict call builds the predictor and fuses layers; pay that before traffic arrives.
+    dummy = np.zeros((MODEL_WARMUP_SIZE, MODEL_WARMUP_SIZE, 3), dtype=np.uint8)
+    for _ in range(max(0, MODEL_WARMUP_PASSES)):
+        model(dummy, verbose=False)
+
+
+def warm_up_ocr(reader) -> None:
+    dummy = np.full((48, 160), 255, dtype=np.uint8)
+    cv2.putText(dummy, "AB1234", (8, 34), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2)
+    reader.readtext(dummy, detail=0, paragraph=False)
+
+
+# Populated in the background by load_runtime(); nothing touches them before model_ready is set.
+# Pipelines read active_model once per frame, so a reload swaps the reference and never
+# mutates a handle that is in use.
+active_model: Optional[ModelHandle] = None
+previous_model: Optional[ModelHandle] = None
+model_swap_lock = threading.Lock()
+model_reload_state: Dict[str, Optional[str]] = {"status": "idle", "target": None, "error": None}
+OCR_READER = None
+
+PROCESS_STARTED_AT = time.time()
+model_ready = threading.Event()
+ocr_ready = threading.Event()
+startup_timings: Dict[str, float] = {}
+startup_error: Optional[str] = None
+
+
+def load_model_in_background() -> None:
+    global active_model, startup_error
+
+    started = time.time()
+    for attempt in range(1, MODEL_LOAD_MAX_ATTEMPTS + 1):
+        try:
+            handle = load_model()
+            break
+        except Exception as exc:
+            startup_error = f"Model load failed (attempt {attempt}/{MODEL_LOAD_MAX_ATTEMPTS}): {exc}"
+            logger.error(startup_error)
+        if attempt < MODEL_LOAD_MAX_ATTEMPTS:
+            time.sleep(min(2 ** attempt, MODEL_LOAD_RETRY_MAX_SECONDS))
+    else:
+        # Camera and video workers block on model_ready; exit so the orchestrator restarts
+        # the service instead of leaving it up and idle.
+        logger.critical("Giving up on loading the detection model; exiting.")
+        os._exit(1)
+
+    startup_error = None
+    with model_swap_lock:
+        active_model = handle
+    startup_timings["model_seconds"] = round(time.time() - started, 2)
+    model_ready.set()
+    logger.info("Model ready in %.2fs", startup_timings["model_seconds"])
+
+
+def load_ocr_in_background() -> None:
+    global OCR_READER
+
+    started = time.time()
+    reader = init_ocr_reader()
+    if reader is not None:
+        try:
+            warm_up_ocr(reader)
+        except Exception as exc:  # pragma: no cover - runtime fallback
+            logger.warning("EasyOCR warm-up failed: %s", exc)
+
+    OCR_READER = reader
+    startup_timings["ocr_seconds"] = round(time.time() - started, 2)
+    # OCR is optional; readiness only waits for the attempt to finish.
+    ocr_ready.set()
+
+
+def load_runtime() -> None:
+    threading.Thread(target=load_model_in_background, daemon=True).start()
+    threading.Thread(target=load_ocr_in_background, daemon=True).start()
+
+
+def is_service_ready() -> bool:
+    return model_ready.is_set() and ocr_ready.is_set()
+
+
+def wait_until_ready(timeout: Optional[float] = None) -> bool:
+    deadline = None if timeout is None else time.time() + timeout
+    for event in (model_ready, ocr_ready):
+        remaining = None if deadline is None else max(0.0, deadline - time.time())
+        if not event.wait(remaining):
+            return False
+    if "ready_seconds" not in startup_timings:
+        startup_timings["ready_seconds"] = round(time.time() - PROCESS_STARTED_AT, 2)
+    return True
+
+
+def get_active_model() -> ModelHandle:
+    handle = active_model
+    if handle is None:
+        raise RuntimeError("Detection model is not loaded")
+    return handle
+
+
+def swap_active_model(handle: ModelHandle) -> None:
+    global active_model, previous_model
+
+    with model_swap_lock:
+        previous_model, active_model = active_model, handle
+    logger.info("Active model is now %s (previous: %s)", handle.version, previous_model.version if previous_model else None)
+
+
+def reload_model_in_background(model_path: str, version: Optional[str]) -> None:
+    try:
+        handle = load_model_handle(model_path, version)
+    except Exception as exc:
+        logger.error("Model reload from %s failed: %s", model_path, exc)
+        with model_swap_lock:
+            model_reload_state.update({"status": "failed", "error": str(exc)})
+        return
+
+    swap_active_model(handle)
+    with model_swap_lock:
+        model_reload_state.update({"status": "idle", "target": None, "error": None})
+
+
+def resolve_model_path(raw_path: str) -> str:
+    candidate = Path(raw_path)
+    if not candidate.is_absolute():
+        candidate = MODELS_DIR / candidate
+    candidate = candidate.resolve()
+
+    if MODELS_DIR.resolve() not in candidate.parents:
+        raise HTTPException(status_code=400, detail=f"Model path must be inside {MODELS_DIR}")
+    if not candidate.is_file():
+        raise HTTPException(status_code=404, detail="Model file not found")
+    return str(candidate)
+
+
+def downscale_frame(frame: np.ndarray, max_side: int, even: bool = False) -> Tuple[np.ndarray, float]:
+    height, width = frame.shape[:2]
+    scale = 1.0
+    if max_side > 0 and max(height, width) > max_side:
+        scale = max_side / float(max(height, width))
+
+    target_width, target_height = int(width * scale), int(height * scale)
+    if even:
+        # libx264 with yuv420p rejects odd frame sizes.
+        target_width, target_height = target_width - target_width % 2, target_height - target_height % 2
+    if (target_width, target_height) == (width, height):
+        return frame, 1.0
+
+    resized = cv2.resize(frame, (target_width, target_height), interpolation=cv2.INTER_AREA)
+    return resized, scale
+
+
+def prepare_detection_frame(frame: np.ndarray) -> Tuple[np.ndarray, float]:
+    if PIPELINE_MODE != "split":
+        return frame, 1.0
+    return downscale_frame(frame, DETECTION_MAX_SIDE)
+
+
+def parse_boxes(result, scale: float = 1.0, offset: Tuple[int, int] = (0, 0)) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return np.zeros((0, 4), dtype=int), np.zeros(0, dtype=np.float32), np.zeros(0, dtype=int)
+
+    coords = boxes.xyxy.cpu().numpy() / scale
+    coords[:, [0, 2]] += offset[0]
+    coords[:, [1, 3]] += offset[1]
+    return coords.astype(int), boxes.conf.cpu().numpy(), boxes.cls.cpu().numpy().astype(int)
+
+
+def build_detections(handle: ModelHandle, coords: np.ndarray, confidences: np.ndarray, class_ids: np.ndarray) -> List[Detection]:
+    vehicle_rows: List[int] = []
+    plate_rows: List[int] = []
+    for row, (confidence, class_id) in enumerate(zip(confidences, class_ids)):
+        info = handle.class_info.get(int(class_id))
+        if info is None:
+            continue
+        if info[3]:
+            if confidence >= PLATE_DETECTION_CONFIDENCE:
+                plate_rows.append(row)
+        elif info[1] and confidence >= DETECTION_CONFIDENCE:
+            vehicle_rows.append(row)
+
+    if not vehicle_rows:
+        return []
+
+    plate_matches = match_plates_to_vehicles(coords[vehicle_rows], coords[plate_rows])
+    detections: List[Detection] = []
+    for row, plate_box in zip(vehicle_rows, plate_matches):
+        class_name, _, violation_type, _ = handle.class_info[int(class_ids[row])]
+        x1, y1, x2, y2 = (int(v) for v in coords[row])
+        detections.append(Detection(x1, y1, x2, y2, class_name, float(confidences[row]), violation_type, plate_box))
+    return detections
+
+
+def detect_objects(handle: ModelHandle, frame: np.ndarray, scale: float = 1.0) -> List[Detection]:
+    """Runs the model on `frame` and returns vehicle detections in full-resolution coordinates.
+
+    `scale` is the factor the caller applied when downscaling `frame`; boxes are
+    divided by it so OCR and evidence crops can be cut from the original frame.
+    """
+    results = handle.model(frame, verbose=False)
+    if not results:
+        return []
+    return build_detections(handle, *parse_boxes(results[0], scale))
+
+
+class TileConfig(NamedTuple):
+    rows: int
+    cols: int
+    overlap: float
+    motion_only: bool
+
+
+def get_tile_config(cam_id: str) -> Optional[TileConfig]:
+    raw = TILED_CAMERAS.get(cam_id, TILED_CAMERAS.get("*"))
+    if not raw:
+        return None
+
+    try:
+        config = TileConfig(
+            rows=max(1, int(raw.get("rows", 2))),
+            cols=max(1, int(raw.get("cols", 2))),
+            overlap=min(max(float(raw.get("overlap", 0.2)), 0.0), 0.5),
+            motion_only=bool(raw.get("motionOnly", False)),
+        )
+    except (AttributeError, TypeError, ValueError) as exc:
+        logger.warning("Ignoring invalid tile config for camera %s: %s", cam_id, exc)
+        return None
+    if config.rows * config.cols == 1:
+        return None
+    return config
+
+
+@functools.lru_cache(maxsize=64)
+def compute_tile_layout(width: int, height: int, rows: int, cols: int, overlap: float) -> Tuple[Tuple[int, int, int, int], ...]:
+    tile_w = int(np.ceil(width / (cols - (cols - 1) * overlap)))
+    tile_h = int(np.ceil(height / (rows - (rows - 1) * overlap)))
+    step_x = tile_w * (1 - overlap)
+    step_y = tile_h * (1 - overlap)
+
+    tiles = []
+    for row in range(rows):
+        for col in range(cols):
+            x1 = min(int(col * step_x), max(0, width - tile_w))
+            y1 = min(int(row * step_y), max(0, height - tile_h))
+            tiles.append((x1, y1, min(width, x1 + tile_w), min(height, y1 + tile_h)))
+    return tuple(tiles)
+
+
+def merge_overlapping_boxes(coords: np.ndarray, confidences: np.ndarray, class_ids: np.ndarray) -> np.ndarray:
+    """Per-class NMS across tiles.
+
+    Besides IoU, a box mostly contained in a stronger box of the same class is
+    dropped, which removes the partial copies of vehicles cut by a tile edge.
+    """
+    if len(coords) == 0:
+        return np.zeros(0, dtype=int)
+
+    boxes = coords.astype(np.float32)
+    areas = np.maximum((boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1]), 1.0)
+    suppressed = np.zeros(len(boxes), dtype=bool)
+    keep: List[int] = []
+
+    for index in np.argsort(-confidences):
+        if suppressed[index]:
+            continue
+        keep.append(int(index))
+        suppressed[index] = True
+
+        inter_w = np.clip(np.minimum(boxes[index, 2], boxes[:, 2]) - np.maximum(boxes[index, 0], boxes[:, 0]), 0, None)
+        inter_h = np.clip(np.minimum(boxes[index, 3], boxes[:, 3]) - np.maximum(boxes[index, 1], boxes[:, 1]), 0, None)
+        inter = inter_w * inter_h
+        iou = inter / (areas[index] + areas - inter)
+        containment = inter / np.minimum(areas[index], areas)
+        same_class = class_ids == class_ids[index]
+        suppressed |= same_class & ((iou > TILE_NMS_IOU) | (containment > TILE_NMS_CONTAINMENT))
+
+    return np.array(keep, dtype=int)
+
+
+def select_moving_tiles(
+    frame: np.ndarray,
+    tiles: Tuple[Tuple[int, int, int, int], ...],
+    previous_gray: Optional[np.ndarray],
+) -> Tuple[List[Tuple[int, int, int, int]], np.ndarray]:
+    height, width = frame.shape[:2]
+    factor = max(1, TILE_MOTION_DOWNSCALE)
+    small = cv2.resize(frame, (max(1, width // factor), max(1, height // factor)), interpolation=cv2.INTER_AREA)
+    gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+    if previous_gray is None or previous_gray.shape != gray.shape:
+        return list(tiles), gray
+
+    _, motion = cv2.threshold(cv2.absdiff(gray, previous_gray), 25, 1, cv2.THRESH_BINARY)
+    moving = []
+    for x1, y1, x2, y2 in tiles:
+        region = motion[y1 // factor:max(y1 // factor + 1, y2 // factor), x1 // factor:max(x1 // factor + 1, x2 // factor)]
+        if region.size and float(region.mean()) >= TILE_MOTION_MIN_FRACTION:
+            moving.append((x1, y1, x2, y2))
+    return moving, gray
+
+
+def detect_objects_tiled(
+    handle: ModelHandle,
+    frame: np.ndarray,
+    config: TileConfig,
+    previous_gray: Optional[np.ndarray] = None,
+) -> Tuple[List[Detection], Optional[np.ndarray]]:
+    """Runs overlapping full-resolution tiles through the model in one batch.
+
+    The downscaled full frame is always part of the batch, so a large vehicle
+    cut by a tile seam is also seen whole and its partial copies are dropped by
+    the containment NMS. In motion-only mode only tiles with inter-frame motion
+    are added, so static scenes cost one pass. Returns the detections and the
+    motion reference for the next call.
+    """
+    height, width = frame.shape[:2]
+    tiles = compute_tile_layout(width, height, config.rows, config.cols, config.overlap)
+
+    detection_frame, detection_scale = prepare_detection_frame(frame)
+    images: List[np.ndarray] = [detection_frame]
+    transforms: List[Tuple[float, Tuple[int, int]]] = [(detection_scale, (0, 0))]
+    if config.motion_only:
+        selected, previous_gray = select_moving_tiles(frame, tiles, previous_gray)
+    else:
+        selected = list(tiles)
+
+    for x1, y1, x2, y2 in selected:
+        images.append(frame[y1:y2, x1:x2])
+        transforms.append((1.0, (x1, y1)))
+
+    results = handle.model(images, verbose=False)
+    parsed = [parse_boxes(result, scale, offset) for result, (scale, offset) in zip(results, transforms)]
+    coords = np.concatenate([part[0] for part in parsed])
+    confidences = np.concatenate([part[1] for part in parsed])
+    class_ids = np.concatenate([part[2] for part in parsed])
+
+    keep = merge_overlapping_boxes(coords, confidences, class_ids)
+    return build_detections(handle, coords[keep], confidences[keep], class_ids[keep]), previous_gray
+
+
+CachedDetection = Tuple[Detection, Optional[str]]
+
+
+class DetectionCache:
+    """LRU of detections and plate reads for file-backed cameras.
+
+    Entries are keyed by (source identity, pipeline signature, frame index), so a
+    changed file, model version or pipeline setting never replays stale results.
+    With DETECTION_CACHE_PERSIST the entries of a source are also kept in a
+    sidecar JSON file next to the video and reloaded on the next attach.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple[str, str, int], List[CachedDetection]]" = OrderedDict()
+        self.loaded: set = set()
+        self.dirty: set = set()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def source_key(video_path: str) -> Optional[str]:
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        return f"{os.path.realpath(video_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    @staticmethod
+    def sidecar_path(video_path: str) -> Path:
+        path = Path(video_path)
+        return path.with_name(f"{path.name}.detcache.json")
+
+    def get(self, source: str, signature: str, frame_index: int) -> Optional[List[CachedDetection]]:
+        key = (source, signature, frame_index)
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return cached
+
+    def put(self, source: str, signature: str, frame_index: int, value: List[CachedDetection]) -> None:
+        with self.lock:
+            self.entries[(source, signature, frame_index)] = value
+            self.dirty.add((source, signature))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def load_sidecar(self, video_path: str, source: str, signature: str) -> None:
+        if (source, signature) in self.loaded:
+            return
+        self.loaded.add((source, signature))
+
+        sidecar = self.sidecar_path(video_path)
+        if not sidecar.exists():
+            return
+        try:
+            with open(sidecar, "r") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable detection cache %s: %s", sidecar, exc)
+            return
+        if stored.get("source") != source or stored.get("signature") != signature:
+            return
+
+        for raw_index, rows in stored.get("frames", {}).items():
+            value = [
+                (Detection(*row[:7], plate_box=tuple(row[7]) if row[7] else None), row[8])
+                for row in rows
+            ]
+            self.put(source, signature, int(raw_index), value)
+        with self.lock:
+            self.dirty.discard((source, signature))
+        logger.info("Loaded %s cached frames from %s", len(stored.get("frames", {})), sidecar)
+
+    def save_sidecar(self, video_path: str, source: str, signature: str) -> None:
+        with self.lock:
+            if (source, signature) not in self.dirty:
+                return
+            self.dirty.discard((source, signature))
+            frames = {
+                str(frame_index): [list(detection[:7]) + [detection.plate_box, plate] for detection, plate in value]
+                for (entry_source, entry_signature, frame_index), value in self.entries.items()
+                if entry_source == source and entry_signature == signature
+            }
+
+        sidecar = self.sidecar_path(video_path)
+        try:
+            tmp_path = sidecar.with_name(f"{sidecar.name}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"source": source, "signature": signature, "frames": frames}, f)
+            os.replace(tmp_path, sidecar)
+        except OSError as exc:
+            logger.warning("Could not persist detection cache to %s: %s", sidecar, exc)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+detection_cache = DetectionCache(DETECTION_CACHE_MAX_ENTRIES)
+
+
+def pipeline_signature(handle: ModelHandle, tile_config: Optional["TileConfig"]) -> str:
+    return "|".join(
+        str(part)
+        for part in (
+            handle.version,
+            PIPELINE_MODE,
+            DETECTION_MAX_SIDE,
+            # "full" marks tiled results that include the full-frame pass.
+            ("full",) + tuple(tile_config) if tile_config else None,
+            DETECTION_CONFIDENCE,
+            PLATE_DETECTION_CONFIDENCE,
+            OCR_READER is not None,
+        )
+    )
 
 
 def assert_internal(request: Request) -> None:
@@ -142,11 +771,21 @@ def normalize_plate_text(raw: str) -> Optional[str]:
     return cleaned
 
 
-def extract_plate_text(frame: np.ndarray, bbox: Tuple[int, int, int, int]) -> Optional[str]:
-    if OCR_READER is None:
-        return None
-
+def pad_box(bbox: Tuple[int, int, int, int], ratio: float) -> Tuple[int, int, int, int]:
     x1, y1, x2, y2 = bbox
+    pad_x = int((x2 - x1) * ratio)
+    pad_y = int((y2 - y1) * ratio)
+    return x1 - pad_x, y1 - pad_y, x2 + pad_x, y2 + pad_y
+
+
+def crop_plate_region(
+    frame: np.ndarray,
+    bbox: Tuple[int, int, int, int],
+    plate_box: Optional[Tuple[int, int, int, int]] = None,
+) -> Optional[np.ndarray]:
+    # A localized plate is a fraction of the vehicle's pixels; only fall back to the
+    # whole vehicle box when the detector did not find one.
+    x1, y1, x2, y2 = pad_box(plate_box, PLATE_CROP_PADDING) if plate_box else bbox
     h, w = frame.shape[:2]
 
     x1 = max(0, x1)
@@ -161,7 +800,32 @@ def extract_plate_text(frame: np.ndarray, bbox: Tuple[int, int, int, int]) -> Op
     if roi.size == 0:
         return None
 
-    gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+    return cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+
+
+def score_plate_crop(gray: np.ndarray) -> Optional[float]:
+    """Returns a quality score for a grayscale crop, or None when OCR is not worth trying.
+
+    The gate rejects crops that are too small, too blurred (low Laplacian variance)
+    or too flat (low standard deviation); the score ranks the survivors.
+    """
+    h, w = gray.shape[:2]
+    if w < PLATE_MIN_WIDTH or h < PLATE_MIN_HEIGHT:
+        return None
+
+    sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+    if sharpness < PLATE_MIN_SHARPNESS:
+        return None
+
+    contrast = float(gray.std())
+    if contrast < PLATE_MIN_CONTRAST:
+        return None
+
+    size_factor = min(h / PLATE_MIN_HEIGHT, 4.0)
+    return (sharpness / PLATE_MIN_SHARPNESS) * (contrast / PLATE_MIN_CONTRAST) * size_factor
+
+
+def read_plate_text(gray: np.ndarray) -> Optional[str]:
     gray = cv2.bilateralFilter(gray, 9, 75, 75)
     thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 2)
 
@@ -178,6 +842,110 @@ def extract_plate_text(frame: np.ndarray, bbox: Tuple[int, int, int, int]) -> Op
     return None
 
 
+def associate_plate_tracks(source_id: str, detections: List[Detection]) -> List[PlateTrack]:
+    """Links each detection to the track of the same vehicle in the previous processed frame.
+
+    Pairs are matched one-to-one, same class only, greedily by IoU, and must overlap by
+    at least PLATE_TRACK_MIN_IOU; any other detection starts a new track, so a box
+    never inherits a plate read from a vehicle it was not associated with.
+    """
+    with plate_track_lock:
+        tracks = plate_tracks.get(source_id, [])
+        assigned: List[Optional[PlateTrack]] = [None] * len(detections)
+
+        if tracks and detections:
+            current = np.array([detection.bbox for detection in detections], dtype=np.float32)[:, None, :]
+            previous = np.array([track.bbox for track in tracks], dtype=np.float32)[None, :, :]
+            inter_w = np.clip(np.minimum(current[..., 2], previous[..., 2]) - np.maximum(current[..., 0], previous[..., 0]), 0, None)
+            inter_h = np.clip(np.minimum(current[..., 3], previous[..., 3]) - np.maximum(current[..., 1], previous[..., 1]), 0, None)
+            inter = inter_w * inter_h
+            current_area = (current[..., 2] - current[..., 0]) * (current[..., 3] - current[..., 1])
+            previous_area = (previous[..., 2] - previous[..., 0]) * (previous[..., 3] - previous[..., 1])
+            iou = inter / np.maximum(current_area + previous_area - inter, 1.0)
+            same_class = np.array([d.class_name for d in detections])[:, None] == np.array([t.class_name for t in tracks])[None, :]
+            iou = np.where(same_class, iou, 0.0)
+
+            matched_tracks = set()
+            for flat_index in np.argsort(-iou, axis=None):
+                detection_index, track_index = divmod(int(flat_index), len(tracks))
+                if iou[detection_index, track_index] < PLATE_TRACK_MIN_IOU:
+                    break
+                if assigned[detection_index] is not None or track_index in matched_tracks:
+                    continue
+                assigned[detection_index] = tracks[track_index]
+                matched_tracks.add(track_index)
+
+        kept = []
+        for track in tracks:
+            if any(track is match for match in assigned):
+                continue
+            track.misses += 1
+            if track.misses <= PLATE_TRACK_MAX_MISSES:
+                kept.append(track)
+
+        for index, detection in enumerate(detections):
+            track = assigned[index]
+            if track is None:
+                track = PlateTrack(bbox=detection.bbox, class_name=detection.class_name)
+                assigned[index] = track
+            track.bbox = detection.bbox
+            track.misses = 0
+            kept.append(track)
+
+        plate_tracks[source_id] = kept
+
+    return assigned
+
+
+def release_plate_tracks(source_id: str) -> None:
+    with plate_track_lock:
+        plate_tracks.pop(source_id, None)
+
+
+def extract_plate_text(
+    frame: np.ndarray,
+    bbox: Tuple[int, int, int, int],
+    plate_box: Optional[Tuple[int, int, int, int]] = None,
+    track: Optional[PlateTrack] = None,
+) -> Optional[str]:
+    if OCR_READER is None:
+        return None
+
+    gray = crop_plate_region(frame, bbox, plate_box)
+    if gray is None:
+        return None
+
+    now = time.time()
+    quality = score_plate_crop(gray)
+    with plate_track_lock:
+        # Skipped crops never refresh read_at, so a read is only reused for PLATE_TRACK_TTL_SECONDS.
+        fresh = track is not None and now - track.read_at < PLATE_TRACK_TTL_SECONDS
+        cached_plate = track.plate if fresh else None
+        if quality is None:
+            ocr_stats["skipped_low_quality"] += 1
+        elif fresh and quality <= track.quality:
+            # An equal or better crop of this vehicle was already read; reuse its result.
+            ocr_stats["skipped_not_better"] += 1
+            quality = None
+        else:
+            ocr_stats["attempted"] += 1
+
+    if quality is None:
+        return cached_plate
+
+    plate = read_plate_text(gray)
+
+    with plate_track_lock:
+        if plate:
+            ocr_stats["succeeded"] += 1
+        if track is not None:
+            track.quality = quality
+            track.plate = plate or cached_plate
+            track.read_at = now
+
+    return plate or cached_plate
+
+
 def infer_violation_type(class_name: str) -> str:
     normalized = class_name.lower().replace(" ", "_")
 
@@ -196,6 +964,36 @@ def is_trackable_class(class_name: str) -> bool:
     return any(hint in normalized for hint in TRACKABLE_LABEL_HINTS)
 
 
+def is_plate_class(class_name: str) -> bool:
+    return "plate" in class_name.lower()
+
+
+def match_plates_to_vehicles(vehicle_boxes: np.ndarray, plate_boxes: np.ndarray) -> List[Optional[Tuple[int, int, int, int]]]:
+    """Assigns each vehicle box the plate box most contained within it, if any.
+
+    Containment is the share of the plate's area inside the vehicle box, computed
+    for every vehicle/plate pair at once.
+    """
+    if len(vehicle_boxes) == 0:
+        return []
+    if len(plate_boxes) == 0:
+        return [None] * len(vehicle_boxes)
+
+    vehicles = vehicle_boxes[:, None, :].astype(np.float32)
+    plates = plate_boxes[None, :, :].astype(np.float32)
+    inter_w = np.clip(np.minimum(vehicles[..., 2], plates[..., 2]) - np.maximum(vehicles[..., 0], plates[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(vehicles[..., 3], plates[..., 3]) - np.maximum(vehicles[..., 1], plates[..., 1]), 0, None)
+    plate_area = np.maximum((plates[..., 2] - plates[..., 0]) * (plates[..., 3] - plates[..., 1]), 1.0)
+    containment = (inter_w * inter_h) / plate_area
+
+    best = containment.argmax(axis=1)
+    best_score = containment[np.arange(len(vehicle_boxes)), best]
+    return [
+        tuple(int(v) for v in plate_boxes[plate_index]) if score >= PLATE_CONTAINMENT_THRESHOLD else None
+        for plate_index, score in zip(best, best_score)
+    ]
+
+
 def build_detection_identity(plate_number: Optional[str], bbox: Tuple[int, int, int, int]) -> str:
     if plate_number:
         return plate_number
@@ -339,20 +1137,15 @@ def stop_hls_process(cam_id: str) -> None:
     logger.info("Stopped HLS stream process for camera %s", cam_id)
 
 
-def run_live_streaming(cam_id: str, frame: np.ndarray) -> None:
-    if not streaming_active.get(cam_id):
-        stop_hls_process(cam_id)
-        return
-
-    height, width = frame.shape[:2]
-    ensure_hls_process(cam_id, width, height, 20)
+def annotate_frame(cam_id: str, frame: np.ndarray, max_side: int, even: bool = False) -> np.ndarray:
+    # Resizing already yields a private copy to draw on; only native-size output needs one.
+    annotated, scale = downscale_frame(frame, max_side, even)
+    if annotated is frame:
+        annotated = frame.copy()
 
-    process = streaming_processes.get(cam_id)
-    if process is None or process.stdin is None:
-        return
-
-    annotated = frame.copy()
-    for x1, y1, x2, y2, label, conf in latest_detections.get(cam_id, []):
+    for detection in latest_detections.get(cam_id, []):
+        x1, y1, x2, y2 = (int(v * scale) for v in detection[:4])
+        label, conf = detection[4], detection[5]
         cv2.rectangle(annotated, (x1, y1), (x2, y2), (0, 255, 0), 2)
         cv2.putText(
             annotated,
@@ -364,6 +1157,22 @@ def run_live_streaming(cam_id: str, frame: np.ndarray) -> None:
             1,
             cv2.LINE_AA,
         )
+    return annotated
+
+
+def run_live_streaming(cam_id: str, frame: np.ndarray) -> None:
+    if not streaming_active.get(cam_id):
+        stop_hls_process(cam_id)
+        return
+
+    # The encoder gets a bounded preview rather than the native frame.
+    annotated = annotate_frame(cam_id, frame, HLS_MAX_SIDE, even=True)
+    height, width = annotated.shape[:2]
+    ensure_hls_process(cam_id, width, height, 20)
+
+    process = streaming_processes.get(cam_id)
+    if process is None or process.stdin is None:
+        return
 
     try:
         process.stdin.write(annotated.tobytes())
@@ -372,8 +1181,96 @@ def run_live_streaming(cam_id: str, frame: np.ndarray) -> None:
         stop_hls_process(cam_id)
 
 
+class PreviewBroadcaster:
+    """Fans one JPEG-encoded, annotated frame out to every preview viewer of a camera.
+
+    The camera reader encodes at most PREVIEW_FPS frames per second and only while
+    someone is watching. Viewers are async generators that await an event the reader
+    sets from its thread, so an open stream never holds a threadpool worker.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self.sequence = 0
+        self.jpeg: Optional[bytes] = None
+        self.last_encoded = 0.0
+        self.closed = False
+
+    def publish(self, cam_id: str, frame: np.ndarray) -> None:
+        now = time.time()
+        if not self.waiters or now - self.last_encoded < 1.0 / max(PREVIEW_FPS, 0.1):
+            return
+
+        annotated = annotate_frame(cam_id, frame, PREVIEW_MAX_SIDE)
+        success, encoded = cv2.imencode(".jpg", annotated, [cv2.IMWRITE_JPEG_QUALITY, PREVIEW_JPEG_QUALITY])
+        if not success:
+            return
+
+        with self.lock:
+            self.jpeg = encoded.tobytes()
+            self.sequence += 1
+            self.last_encoded = now
+        self.wake_viewers()
+
+    def open(self) -> None:
+        with self.lock:
+            self.closed = False
+
+    def close(self) -> None:
+        with self.lock:
+            self.closed = True
+        self.wake_viewers()
+
+    def wake_viewers(self) -> None:
+        with self.lock:
+            waiters = list(self.waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The viewer's event loop has already shut down.
+                pass
+
+    async def frames(self):
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self.lock:
+            self.waiters.add(waiter)
+        last_sequence = 0
+        try:
+            while True:
+                # Clear before reading so a frame published in between still wakes us.
+                waiter[1].clear()
+                with self.lock:
+                    closed, sequence, jpeg = self.closed, self.sequence, self.jpeg
+                if closed:
+                    return
+                if sequence == last_sequence or jpeg is None:
+                    try:
+                        await asyncio.wait_for(waiter[1].wait(), timeout=10)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                last_sequence = sequence
+                yield (
+                    b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+                    + str(len(jpeg)).encode()
+                    + b"\r\n\r\n"
+                    + jpeg
+                    + b"\r\n"
+                )
+        finally:
+            with self.lock:
+                self.waiters.discard(waiter)
+
+
+preview_broadcasters: Dict[str, PreviewBroadcaster] = defaultdict(PreviewBroadcaster)
+
+
 def stream_reader(cam_id: str, rtsp_url: str, lat: Optional[float], lng: Optional[float], stop_event: threading.Event) -> None:
     logger.info("Starting camera reader for %s (%s)", cam_id, rtsp_url)
+    # A previous reader for this camera may have closed the broadcaster on exit.
+    preview_broadcasters[cam_id].open()
 
     failure_count = 0
     frame_count = 0
@@ -381,6 +1278,10 @@ def stream_reader(cam_id: str, rtsp_url: str, lat: Optional[float], lng: Optiona
     start_time = time.time()
     last_heartbeat_time = 0.0
     source_is_file = "://" not in rtsp_url
+    tile_config = get_tile_config(cam_id)
+    motion_reference: Optional[np.ndarray] = None
+    if tile_config:
+        logger.info("Camera %s uses tiled inference %s", cam_id, tile_config)
 
     while not stop_event.is_set():
         cap = cv2.VideoCapture(rtsp_url)
@@ -391,6 +1292,10 @@ def stream_reader(cam_id: str, rtsp_url: str, lat: Optional[float], lng: Optiona
             continue
 
         source_frame_interval = 0.0
+        # Looping file sources replay cached detections keyed by their position in the file.
+        cache_source = DetectionCache.source_key(rtsp_url) if source_is_file else None
+        cache_signature: Optional[str] = None
+        file_frame_index = 0
         if source_is_file:
             source_fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
             if source_fps <= 0 or source_fps > 120:
@@ -406,39 +1311,52 @@ def stream_reader(cam_id: str, rtsp_url: str, lat: Optional[float], lng: Optiona
                     logger.warning("Frame read failed for camera %s. reconnecting.", cam_id)
                 else:
                     logger.info("End of file source reached for camera %s. restarting stream.", cam_id)
+                    if DETECTION_CACHE_PERSIST and cache_source and cache_signature:
+                        detection_cache.save_sidecar(rtsp_url, cache_source, cache_signature)
                 break
 
             frame_count += 1
+            file_frame_index += 1
             now = time.time()
             frame_timestamps.append(now)
             if len(frame_timestamps) > 30:
                 frame_timestamps.pop(0)
             fps = len(frame_timestamps) / max(frame_timestamps[-1] - frame_timestamps[0], 1e-6) if len(frame_timestamps) > 1 else 0.0
 
-            if frame_count % max(1, STREAM_FRAME_SKIP) == 0:
-                infer_start = time.time()
-                results = MODEL(frame, verbose=False)
+            # File sources skip by position in the file so every loop processes the same frames.
+            skip_counter = file_frame_index if cache_source else frame_count
+            if skip_counter % max(1, STREAM_FRAME_SKIP) == 0:
+                handle = get_active_model()
+                cached = None
+                if cache_source:
+                    cache_signature = pipeline_signature(handle, tile_config)
+                    if DETECTION_CACHE_PERSIST:
+                        detection_cache.load_sidecar(rtsp_url, cache_source, cache_signature)
+                    cached = detection_cache.get(cache_source, cache_signature, file_frame_index)
+
+                if cached is not None:
+                    found_with_plates = cached
+                else:
+                    if tile_config:
+                        found, motion_reference = detect_objects_tiled(handle, frame, tile_config, motion_reference)
+                    else:
+                        detection_frame, detection_scale = prepare_detection_frame(frame)
+                        found = detect_objects(handle, detection_frame, detection_scale)
+                    found_with_plates = [
+                        (detection, extract_plate_text(frame, detection.bbox, detection.plate_box, track))
+                        for detection, track in zip(found, associate_plate_tracks(cam_id, found))
+                    ]
+                    if cache_source and cache_signature:
+                        detection_cache.put(cache_source, cache_signature, file_frame_index, found_with_plates)
                 infer_end = time.time()
                 latency_ms = int((infer_end - capture_start) * 1000)
 
                 detections: List[Tuple[int, int, int, int, str, float]] = []
-                boxes = results[0].boxes if results and len(results) > 0 else []
 
-                for box in boxes:
-                    confidence = float(box.conf)
-                    if confidence < DETECTION_CONFIDENCE:
-                        continue
-
-                    class_id = int(box.cls)
-                    class_name = str(results[0].names.get(class_id, class_id)).strip()
-                    if not is_trackable_class(class_name):
-                        continue
-
-                    x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
+                for detection, plate_number in found_with_plates:
+                    x1, y1, x2, y2, class_name, confidence, violation_type = detection[:7]
                     detections.append((x1, y1, x2, y2, class_name, confidence))
 
-                    violation_type = infer_violation_type(class_name)
-                    plate_number = extract_plate_text(frame, (x1, y1, x2, y2))
                     dedup_identity = build_detection_identity(plate_number, (x1, y1, x2, y2))
 
                     if not should_emit_violation(cam_id, violation_type, plate_number, (x1, y1, x2, y2)):
@@ -456,6 +1374,7 @@ def stream_reader(cam_id: str, rtsp_url: str, lat: Optional[float], lng: Optiona
                         "videoTimestampSeconds": f"{now - start_time:.2f}",
                         "boundingBox": json.dumps([x1, y1, x2, y2]),
                         "dedupKey": dedup_identity,
+                        "modelVersion": handle.version,
                     }
                     post_live_violation(cam_id, payload, frame)
 
@@ -466,9 +1385,11 @@ def stream_reader(cam_id: str, rtsp_url: str, lat: Optional[float], lng: Optiona
                     last_heartbeat_time = now
 
             with frame_lock:
-                latest_frames[cam_id] = frame.copy()
+                # cap.read() allocates a new array per frame, so the reference can be shared as-is.
+                latest_frames[cam_id] = frame
 
             run_live_streaming(cam_id, frame)
+            preview_broadcasters[cam_id].publish(cam_id, frame)
 
             # Local file streams need explicit pacing; RTSP streams are naturally rate-limited.
             if source_frame_interval > 0:
@@ -482,10 +1403,14 @@ def stream_reader(cam_id: str, rtsp_url: str, lat: Optional[float], lng: Optiona
             time.sleep(2)
 
     stop_hls_process(cam_id)
+    preview_broadcasters[cam_id].close()
+    release_plate_tracks(cam_id)
     logger.info("Camera reader stopped for %s", cam_id)
 
 
 def discover_and_attach_cameras() -> None:
+    wait_until_ready()
+
     while True:
         try:
             response = requests.get(
@@ -553,6 +1478,9 @@ def ensure_camera_thread(cam_id: str) -> bool:
     if thread is not None and thread.is_alive():
         return True
 
+    if not is_service_ready():
+        return False
+
     try:
         response = requests.get(
             f"{BACKEND_API_URL}/cameras",
@@ -609,7 +1537,28 @@ def post_video_status(video_id: str, status: str, duration_seconds: Optional[flo
         logger.warning("Failed to update video %s status to %s: %s", video_id, status, exc)
 
 
-def post_video_violation(video_id: str, payload: dict) -> None:
+def post_video_progress(video_id: str, frames_done: int, total_frames: int, eta_seconds: Optional[float]) -> None:
+    percent = (frames_done / total_frames * 100) if total_frames > 0 else None
+    payload = {
+        "framesProcessed": int(frames_done),
+        "totalFrames": int(total_frames),
+        "percent": None if percent is None else round(min(percent, 100.0), 2),
+        "etaSeconds": None if eta_seconds is None else round(eta_seconds, 1),
+    }
+
+    try:
+        requests.patch(
+            f"{BACKEND_API_URL}/videos/{video_id}/progress",
+            json=payload,
+            headers=REQUEST_HEADERS,
+            timeout=5,
+        )
+    except Exception as exc:
+        logger.warning("Failed to report progress for video %s: %s", video_id, exc)
+
+
+def post_video_violation(video_id: str, payload: dict) -> int:
+    """Posts one violation and returns the HTTP status, or 0 if the request itself failed."""
     try:
         response = requests.post(
             f"{BACKEND_API_URL}/videos/{video_id}/violations",
@@ -621,9 +1570,228 @@ def post_video_violation(video_id: str, payload: dict) -> None:
             logger.warning("Video violation post failed (%s): %s", response.status_code, response.text)
     except Exception as exc:
         logger.warning("Video violation post exception for %s: %s", video_id, exc)
+        return 0
+    return response.status_code
+
+
+def is_rejected_violation_status(status: int) -> bool:
+    # The backend refused the payload itself; retrying would only fail again. Auth and
+    # throttling errors are configuration or load problems and stay retryable.
+    return 400 <= status < 500 and status not in (401, 403, 408, 429)
+
+
+def write_evidence_image(frame: np.ndarray, evidence_path: Path) -> bool:
+    success, encoded = cv2.imencode(".jpg", frame)
+    if not success:
+        return False
+
+    with open(evidence_path, "wb") as f:
+        f.write(encoded.tobytes())
+    return True
+
+
+class VideoViolationReporter:
+    """Buffers video violations and posts them to the backend in bulk.
+
+    Evidence images are encoded and written on the shared evidence pool while
+    the job keeps decoding; a batch is only sent once its evidence is on disk.
+    Violations the backend did not accept stay buffered and are retried with
+    backoff; after VIDEO_REPORT_MAX_RETRIES failed flushes in a row the job is
+    aborted so it resumes from the last checkpoint instead of losing them.
+    """
+
+    def __init__(self, video_id: str, redis_client: Optional[redis.Redis] = None) -> None:
+        self.video_id = video_id
+        self.redis_client = redis_client
+        self.pending: List[Tuple[dict, str, Future]] = []
+        self.last_flush_time = time.time()
+        self.failed_flushes = 0
+        self.retry_at = 0.0
+        self.posted = 0
+
+    def add(self, payload: dict, emitted_key: str, frame: np.ndarray, evidence_path: Path) -> None:
+        # cap.read() hands out a fresh array per frame, so the writer can use it without a copy.
+        evidence_future = evidence_writer.submit(write_evidence_image, frame, evidence_path)
+        self.pending.append((payload, emitted_key, evidence_future))
+        if len(self.pending) >= VIDEO_REPORT_BATCH_SIZE:
+            self.flush()
+
+    def flush_if_due(self) -> None:
+        if self.pending and time.time() - self.last_flush_time >= VIDEO_REPORT_FLUSH_SECONDS:
+            self.flush()
+
+    def post_batch(self, payloads: List[dict]) -> List[int]:
+        """Posts a batch and returns the backend's status per violation (0 when unknown)."""
+        try:
+            response = backend_session.post(
+                f"{BACKEND_API_URL}/videos/{self.video_id}/violations/bulk",
+                json={"violations": payloads},
+                headers=REQUEST_HEADERS,
+                timeout=30,
+            )
+        except Exception as exc:
+            logger.warning("Bulk video violation post exception for %s: %s", self.video_id, exc)
+            return [False] * len(payloads)
+
+        if response.status_code == 404:
+            # Backend without the bulk route: fall back to one request per violation.
+            return [post_video_violation(self.video_id, payload) for payload in payloads]
+        if response.status_code >= 300:
+            logger.warning("Bulk video violation post failed (%s): %s", response.status_code, response.text)
+            return [0] * len(payloads)
+
+        # The bulk route answers 200 even when single items fail, so read each item's status.
+        try:
+            results = response.json().get("results")
+            statuses = [int(result.get("status", 0)) for result in results]
+        except (ValueError, TypeError, AttributeError):
+            statuses = []
+        if len(statuses) != len(payloads):
+            logger.warning("Bulk video violation response for %s did not list every item", self.video_id)
+            return [0] * len(payloads)
+        return statuses
+
+    def flush(self) -> bool:
+        """Sends everything buffered; returns True once nothing is left to deliver."""
+        self.last_flush_time = time.time()
+        if not self.pending:
+            return True
+        if self.last_flush_time < self.retry_at:
+            return False
+
+        batch, self.pending = self.pending, []
+        ready: List[Tuple[dict, str, Future]] = []
+        for entry in batch:
+            try:
+                if not entry[2].result():
+                    continue
+            except Exception as exc:
+                logger.warning("Evidence write failed for video %s: %s", self.video_id, exc)
+                continue
+            ready.append(entry)
+
+        if not ready:
+            return True
 
+        statuses = self.post_batch([payload for payload, _, _ in ready])
+        # 201 is a new violation and 200 a duplicate the backend already holds.
+        sent_keys = [emitted_key for (_, emitted_key, _), status in zip(ready, statuses) if status in (200, 201)]
+        self.posted += len(sent_keys)
 
-def process_video(video_id: str, video_path: str) -> None:
+        failed = []
+        for entry, status in zip(ready, statuses):
+            if status in (200, 201):
+                continue
+            if is_rejected_violation_status(status):
+                logger.warning("Backend rejected a violation for video %s (%s); dropping it: %s", self.video_id, status, entry[0])
+                sent_keys.append(entry[1])
+                continue
+            failed.append(entry)
+        mark_video_violations_emitted(self.redis_client, self.video_id, sent_keys)
+
+        if not failed:
+            self.failed_flushes = 0
+            self.retry_at = 0.0
+            return True
+
+        # Undelivered violations go back in front of anything buffered since.
+        self.pending = failed + self.pending
+        self.failed_flushes += 1
+        if self.failed_flushes >= VIDEO_REPORT_MAX_RETRIES:
+            raise RuntimeError(
+                f"Backend rejected {len(failed)} violations for video {self.video_id} "
+                f"after {self.failed_flushes} attempts"
+            )
+        self.retry_at = time.time() + min(2 ** self.failed_flushes, VIDEO_REPORT_RETRY_MAX_SECONDS)
+        return False
+
+    def close(self) -> None:
+        while not self.flush():
+            time.sleep(max(0.0, self.retry_at - time.time()))
+
+
+def load_video_checkpoint(redis_client: Optional[redis.Redis], video_id: str) -> Tuple[int, Dict[Tuple[str, str], float], set]:
+    if redis_client is None:
+        return 0, {}, set()
+
+    try:
+        raw_checkpoint = redis_client.get(f"{VIDEO_CHECKPOINT_PREFIX}{video_id}")
+        emitted_keys = set(redis_client.smembers(f"{VIDEO_CHECKPOINT_PREFIX}{video_id}:emitted"))
+    except Exception as exc:
+        logger.warning("Failed to load checkpoint for video %s: %s", video_id, exc)
+        return 0, {}, set()
+
+    if not raw_checkpoint:
+        return 0, {}, emitted_keys
+
+    checkpoint = json.loads(raw_checkpoint)
+    local_dedup = {
+        (violation_type, identity): float(timestamp)
+        for violation_type, identity, timestamp in checkpoint.get("dedup", [])
+    }
+    return int(checkpoint.get("frameIndex", 0)), local_dedup, emitted_keys
+
+
+def save_video_checkpoint(
+    redis_client: Optional[redis.Redis],
+    video_id: str,
+    frame_index: int,
+    local_dedup: Dict[Tuple[str, str], float],
+) -> None:
+    if redis_client is None:
+        return
+
+    checkpoint = {
+        "frameIndex": frame_index,
+        "dedup": [[violation_type, identity, timestamp] for (violation_type, identity), timestamp in local_dedup.items()],
+        "updatedAt": time.time(),
+    }
+    try:
+        redis_client.set(f"{VIDEO_CHECKPOINT_PREFIX}{video_id}", json.dumps(checkpoint), ex=VIDEO_CHECKPOINT_TTL_SECONDS)
+    except Exception as exc:
+        logger.warning("Failed to checkpoint video %s at frame %s: %s", video_id, frame_index, exc)
+
+
+def mark_video_violations_emitted(redis_client: Optional[redis.Redis], video_id: str, emitted_keys: List[str]) -> None:
+    if redis_client is None or not emitted_keys:
+        return
+
+    emitted_set = f"{VIDEO_CHECKPOINT_PREFIX}{video_id}:emitted"
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.sadd(emitted_set, *emitted_keys)
+        pipe.expire(emitted_set, VIDEO_CHECKPOINT_TTL_SECONDS)
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("Failed to record emitted violation for video %s: %s", video_id, exc)
+
+
+def clear_video_checkpoint(redis_client: Optional[redis.Redis], video_id: str) -> None:
+    if redis_client is None:
+        return
+
+    try:
+        redis_client.delete(f"{VIDEO_CHECKPOINT_PREFIX}{video_id}", f"{VIDEO_CHECKPOINT_PREFIX}{video_id}:emitted")
+    except Exception as exc:
+        logger.warning("Failed to clear checkpoint for video %s: %s", video_id, exc)
+
+
+def seek_video(cap: cv2.VideoCapture, frame_index: int) -> int:
+    if frame_index <= 0:
+        return 0
+
+    if cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index) and int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == frame_index:
+        return frame_index
+
+    # Some containers cannot seek precisely; grab() skips frames without converting them.
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    position = 0
+    while position < frame_index and cap.grab():
+        position += 1
+    return position
+
+
+def process_video(video_id: str, video_path: str, redis_client: Optional[redis.Redis] = None) -> None:
     ensure_upload_dirs()
 
     cap = cv2.VideoCapture(video_path)
@@ -636,10 +1804,32 @@ def process_video(video_id: str, video_path: str) -> None:
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
     duration_seconds = (total_frames / fps) if fps > 0 else 0
 
-    local_dedup: Dict[Tuple[str, str], float] = {}
-    frame_index = 0
+    checkpoint_frame, local_dedup, emitted_keys = load_video_checkpoint(redis_client, video_id)
+    frame_index = seek_video(cap, checkpoint_frame)
+    if frame_index > 0:
+        logger.info("Resuming video %s from frame %s", video_id, frame_index)
+
+    reporter = VideoViolationReporter(video_id, redis_client)
+    # Tracks left by an interrupted run belong to frames that are about to be replayed.
+    track_source = f"video:{video_id}"
+    release_plate_tracks(track_source)
+    resumed_frame = frame_index
+    started_at = time.time()
+    last_progress_time = started_at
+    last_checkpoint_time = started_at
 
     while cap.isOpened():
+        # Every frame before frame_index has been fully handled at this point.
+        if time.time() - last_checkpoint_time >= VIDEO_CHECKPOINT_INTERVAL_SECONDS:
+            # Entries past their cooldown can no longer suppress anything, so they are not kept.
+            cutoff = ((frame_index / fps) if fps > 0 else 0.0) - VIOLATION_COOLDOWN_SECONDS
+            for expired_key in [key for key, seen_at in local_dedup.items() if seen_at <= cutoff]:
+                del local_dedup[expired_key]
+            # Buffered violations must reach the backend before the checkpoint moves past them.
+            if reporter.flush():
+                save_video_checkpoint(redis_client, video_id, frame_index, local_dedup)
+            last_checkpoint_time = time.time()
+
         success, frame = cap.read()
         if not success:
             break
@@ -647,25 +1837,24 @@ def process_video(video_id: str, video_path: str) -> None:
         timestamp = (frame_index / fps) if fps > 0 else 0.0
         frame_index += 1
 
+        now = time.time()
+        if now - last_progress_time >= VIDEO_PROGRESS_INTERVAL_SECONDS:
+            rate = (frame_index - resumed_frame) / max(now - started_at, 1e-6)
+            eta_seconds = (max(total_frames - frame_index, 0) / rate) if total_frames > 0 else None
+            post_video_progress(video_id, frame_index, total_frames, eta_seconds)
+            last_progress_time = now
+
         if frame_index % max(1, VIDEO_FRAME_SKIP) != 0:
             continue
 
-        results = MODEL(frame, verbose=False)
-        boxes = results[0].boxes if results and len(results) > 0 else []
-
-        for box in boxes:
-            confidence = float(box.conf)
-            if confidence < DETECTION_CONFIDENCE:
-                continue
+        reporter.flush_if_due()
+        handle = get_active_model()
 
-            class_id = int(box.cls)
-            class_name = str(results[0].names.get(class_id, class_id)).strip()
-            if not is_trackable_class(class_name):
-                continue
-
-            x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-            violation_type = infer_violation_type(class_name)
-            plate_number = extract_plate_text(frame, (x1, y1, x2, y2))
+        detection_frame, detection_scale = prepare_detection_frame(frame)
+        detections = detect_objects(handle, detection_frame, detection_scale)
+        for detection, track in zip(detections, associate_plate_tracks(track_source, detections)):
+            x1, y1, x2, y2, class_name, confidence, violation_type = detection[:7]
+            plate_number = extract_plate_text(frame, detection.bbox, detection.plate_box, track)
             dedup_identity = build_detection_identity(plate_number, (x1, y1, x2, y2))
             dedup_key = (violation_type, dedup_identity)
 
@@ -674,15 +1863,14 @@ def process_video(video_id: str, video_path: str) -> None:
                 continue
             local_dedup[dedup_key] = timestamp
 
-            success_img, encoded = cv2.imencode(".jpg", frame)
-            if not success_img:
+            # Violations posted before a restart are replayed from the checkpoint, not re-sent.
+            # The key uses the bbox zone rather than the plate read, which can differ on replay
+            # because plate tracks are released on resume.
+            emitted_key = f"{frame_index}:{violation_type}:{build_detection_identity(None, (x1, y1, x2, y2))}"
+            if emitted_key in emitted_keys:
                 continue
 
             evidence_filename = f"vid_ev_{video_id}_{frame_index}.jpg"
-            evidence_path = EVIDENCE_DIR / evidence_filename
-            with open(evidence_path, "wb") as f:
-                f.write(encoded.tobytes())
-
             payload = {
                 "violationType": violation_type,
                 "confidenceScore": confidence * 100,
@@ -692,57 +1880,262 @@ def process_video(video_id: str, video_path: str) -> None:
                 "boundingBox": [x1, y1, x2, y2],
                 "dedupKey": dedup_identity,
                 "evidenceImagePath": f"/uploads/evidence/{evidence_filename}",
+                "modelVersion": handle.version,
             }
-            post_video_violation(video_id, payload)
+            reporter.add(payload, emitted_key, frame, EVIDENCE_DIR / evidence_filename)
+            emitted_keys.add(emitted_key)
 
     cap.release()
+    release_plate_tracks(track_source)
+    reporter.close()
     post_video_status(video_id, "completed", duration_seconds)
-    logger.info("Finished video processing for %s", video_id)
+    clear_video_checkpoint(redis_client, video_id)
+    logger.info("Finished video processing for %s (%s violations reported)", video_id, reporter.posted)
+
+
+def probe_video(video_path: str) -> Tuple[float, int]:
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return 0.0, 0
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    finally:
+        cap.release()
+
+    duration_seconds = (total_frames / fps) if fps > 0 else 0.0
+    return duration_seconds, total_frames
+
+
+def classify_video_job(job: dict) -> str:
+    if str(job.get("priority", "")).lower() in ("urgent", "high"):
+        return "urgent"
+
+    duration_seconds = job.get("durationSeconds")
+    if duration_seconds is None:
+        duration_seconds, total_frames = probe_video(str(job.get("filePath")))
+        job["durationSeconds"] = duration_seconds
+        job["totalFrames"] = total_frames
+
+    # Unknown durations are ranked as long so they never starve real short clips.
+    if 0 < float(duration_seconds) <= VIDEO_SHORT_CLIP_SECONDS:
+        return "short"
+    return "long"
+
+
+def triage_video_job(redis_client: redis.Redis, processing_key: str, raw_job: str) -> None:
+    try:
+        job = json.loads(raw_job)
+    except ValueError:
+        logger.warning("Dropping malformed video job payload: %s", raw_job)
+        redis_client.lrem(processing_key, 1, raw_job)
+        return
+
+    if not isinstance(job, dict):
+        logger.warning("Dropping malformed video job payload: %s", raw_job)
+        redis_client.lrem(processing_key, 1, raw_job)
+        return
+
+    try:
+        priority = classify_video_job(job)
+    except Exception as exc:
+        # A bad duration or an unreadable file must not strand the job in this worker's processing list.
+        logger.warning("Could not classify video %s (%s); queuing it as long", job.get("videoId"), exc)
+        priority = "long"
+    job["priority"] = priority
 
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.lpush(VIDEO_PRIORITY_QUEUES[priority], json.dumps(job))
+    pipe.lrem(processing_key, 1, raw_job)
+    pipe.execute()
+    logger.info("Queued video %s with priority %s", job.get("videoId"), priority)
 
-def video_worker() -> None:
+
+def requeue_video_job(redis_client: redis.Redis, processing_key: str, raw_job: str, count_attempt: bool = True) -> None:
+    try:
+        job = json.loads(raw_job)
+    except ValueError:
+        redis_client.lrem(processing_key, 1, raw_job)
+        return
+    if not isinstance(job, dict):
+        redis_client.lrem(processing_key, 1, raw_job)
+        return
+
+    video_id = str(job.get("videoId"))
+    attempts = int(job.get("attempts", 0)) + (1 if count_attempt else 0)
+    recoveries = int(job.get("recoveries", 0)) + (0 if count_attempt else 1)
+    pipe = redis_client.pipeline(transaction=True)
+    if count_attempt and attempts >= VIDEO_JOB_MAX_ATTEMPTS:
+        logger.warning("Video %s failed %s times. giving up.", video_id, attempts)
+        post_video_status(video_id, "failed")
+    elif recoveries >= VIDEO_JOB_MAX_RECOVERIES:
+        # A video that keeps taking its worker down (OOM, native crash) would otherwise crash-loop the service.
+        logger.warning("Video %s was orphaned %s times. giving up.", video_id, recoveries)
+        post_video_status(video_id, "failed")
+    else:
+        job["attempts"] = attempts
+        job["recoveries"] = recoveries
+        priority = job.get("priority") if job.get("priority") in VIDEO_PRIORITY_QUEUES else "long"
+        # RPUSH puts the job at the consuming end so it is retried before newer uploads.
+        pipe.rpush(VIDEO_PRIORITY_QUEUES[priority], json.dumps(job))
+        logger.info("Requeued video %s (attempt %s)", video_id, attempts + 1)
+    pipe.lrem(processing_key, 1, raw_job)
+    pipe.execute()
+
+
+def recover_processing_list(redis_client: redis.Redis, processing_key: str) -> None:
+    # Orphaned jobs were interrupted by a restart or a lost worker, not by a processing
+    # error, so they resume from their checkpoint without using up an attempt; they have
+    # their own, larger budget of VIDEO_JOB_MAX_RECOVERIES.
+    for raw_job in redis_client.lrange(processing_key, 0, -1):
+        requeue_video_job(redis_client, processing_key, raw_job, count_attempt=False)
+
+
+def reap_dead_video_workers(redis_client: redis.Redis) -> None:
+    # Only one node reaps at a time so a dead worker's jobs are requeued exactly once.
+    if not redis_client.set(VIDEO_REAPER_LOCK_KEY, NODE_ID, nx=True, ex=VIDEO_WORKER_HEARTBEAT_TTL_SECONDS):
+        return
+
+    try:
+        for processing_key in redis_client.scan_iter(match=f"{VIDEO_PROCESSING_PREFIX}*"):
+            worker_name = processing_key[len(VIDEO_PROCESSING_PREFIX):]
+            if redis_client.exists(f"{VIDEO_WORKER_ALIVE_PREFIX}{worker_name}"):
+                continue
+            logger.warning("Recovering jobs from dead video worker %s", worker_name)
+            recover_processing_list(redis_client, processing_key)
+    finally:
+        redis_client.delete(VIDEO_REAPER_LOCK_KEY)
+
+
+def video_worker_heartbeat(worker_names: List[str]) -> None:
     redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=True)
-    logger.info("Video worker started")
+    interval = max(1, VIDEO_WORKER_HEARTBEAT_TTL_SECONDS // 3)
 
     while True:
         try:
-            queue_item = redis_client.blpop("video:queue", timeout=30)
-            if not queue_item:
-                continue
+            pipe = redis_client.pipeline(transaction=False)
+            for worker_name in worker_names:
+                pipe.set(f"{VIDEO_WORKER_ALIVE_PREFIX}{worker_name}", int(time.time()), ex=VIDEO_WORKER_HEARTBEAT_TTL_SECONDS)
+            pipe.execute()
+            reap_dead_video_workers(redis_client)
+        except Exception as exc:
+            logger.warning("Video worker heartbeat error: %s", exc)
+        time.sleep(interval)
 
-            _, raw_job = queue_item
-            job = json.loads(raw_job)
-            video_id = str(job.get("videoId"))
-            file_path = str(job.get("filePath"))
 
-            if not video_id or not file_path:
-                logger.warning("Invalid video job payload: %s", raw_job)
-                continue
+def claim_video_job(
+    redis_client: redis.Redis,
+    processing_key: str,
+    long_job_slots: threading.BoundedSemaphore,
+) -> Optional[Tuple[str, str]]:
+    # Rank everything waiting on the ingress queue before picking, so a short clip
+    # uploaded after a long one is still served first.
+    while True:
+        raw_job = redis_client.rpoplpush(VIDEO_INGRESS_QUEUE, processing_key)
+        if raw_job is None:
+            break
+        triage_video_job(redis_client, processing_key, raw_job)
 
-            logger.info("Processing queued video %s", video_id)
-            post_video_status(video_id, "processing")
-            process_video(video_id, file_path)
+    for priority in VIDEO_PRIORITY_ORDER:
+        if priority == "long" and not long_job_slots.acquire(blocking=False):
+            continue
+        raw_job = redis_client.rpoplpush(VIDEO_PRIORITY_QUEUES[priority], processing_key)
+        if raw_job is not None:
+            return raw_job, priority
+        if priority == "long":
+            long_job_slots.release()
+
+    raw_job = redis_client.brpoplpush(VIDEO_INGRESS_QUEUE, processing_key, timeout=VIDEO_QUEUE_POLL_SECONDS)
+    if raw_job is not None:
+        triage_video_job(redis_client, processing_key, raw_job)
+    return None
+
+
+def run_video_job(redis_client: redis.Redis, processing_key: str, raw_job: str) -> None:
+    try:
+        job = json.loads(raw_job)
+    except ValueError:
+        logger.warning("Invalid video job payload: %s", raw_job)
+        redis_client.lrem(processing_key, 1, raw_job)
+        return
+
+    video_id = str(job.get("videoId") or "")
+    file_path = str(job.get("filePath") or "")
+    if not video_id or not file_path:
+        logger.warning("Invalid video job payload: %s", raw_job)
+        redis_client.lrem(processing_key, 1, raw_job)
+        return
+
+    logger.info("Processing queued video %s (priority=%s)", video_id, job.get("priority"))
+    post_video_status(video_id, "processing")
+    try:
+        process_video(video_id, file_path, redis_client)
+    except Exception as exc:
+        logger.warning("Video %s processing error: %s", video_id, exc)
+        requeue_video_job(redis_client, processing_key, raw_job)
+        return
+
+    redis_client.lrem(processing_key, 1, raw_job)
+
+
+def video_worker(worker_name: str, job_slots: threading.BoundedSemaphore, long_job_slots: threading.BoundedSemaphore) -> None:
+    redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=True)
+    processing_key = f"{VIDEO_PROCESSING_PREFIX}{worker_name}"
+    wait_until_ready()
+    logger.info("Video worker %s started", worker_name)
+
+    recovered = False
+    while True:
+        try:
+            if not recovered:
+                # Jobs left over from a previous run of this worker go back on the queue.
+                recover_processing_list(redis_client, processing_key)
+                recovered = True
+
+            with job_slots:
+                claimed = claim_video_job(redis_client, processing_key, long_job_slots)
+                if claimed is None:
+                    continue
+
+                raw_job, priority = claimed
+                try:
+                    run_video_job(redis_client, processing_key, raw_job)
+                finally:
+                    if priority == "long":
+                        long_job_slots.release()
         except Exception as exc:
-            logger.warning("Video worker loop error: %s", exc)
+            logger.warning("Video worker %s loop error: %s", worker_name, exc)
             time.sleep(2)
 
 
+def start_video_workers() -> None:
+    job_slots = threading.BoundedSemaphore(VIDEO_MAX_CONCURRENT_JOBS)
+    long_job_slots = threading.BoundedSemaphore(VIDEO_MAX_LONG_JOBS)
+    worker_names = [f"{NODE_ID}:{index}" for index in range(VIDEO_WORKER_COUNT)]
+
+    threading.Thread(target=video_worker_heartbeat, args=(worker_names,), daemon=True).start()
+    for worker_name in worker_names:
+        threading.Thread(target=video_worker, args=(worker_name, job_slots, long_job_slots), daemon=True).start()
+
+
 @app.on_event("startup")
 async def startup_event() -> None:
     ensure_upload_dirs()
+    load_runtime()
 
     camera_discovery_thread = threading.Thread(target=discover_and_attach_cameras, daemon=True)
     camera_discovery_thread.start()
 
-    worker_thread = threading.Thread(target=video_worker, daemon=True)
-    worker_thread.start()
+    start_video_workers()
 
-    logger.info("AI service startup complete")
+    logger.info("AI service started; model and OCR loading in background")
 
 
 @app.post("/cameras/{cam_id}/live/start")
 def start_live_stream(cam_id: str, request: Request):
     assert_internal(request)
+    if not is_service_ready():
+        raise HTTPException(status_code=503, detail="AI service is still starting")
     if not ensure_camera_thread(cam_id):
         raise HTTPException(status_code=404, detail="Camera thread not active")
 
@@ -758,6 +2151,21 @@ def stop_live_stream(cam_id: str, request: Request):
     return {"status": "success", "message": f"Live streaming stopped for {cam_id}"}
 
 
+@app.get("/cameras/{cam_id}/preview.mjpg")
+def live_preview(cam_id: str, request: Request):
+    assert_internal(request)
+    if not is_service_ready():
+        raise HTTPException(status_code=503, detail="AI service is still starting")
+    if not ensure_camera_thread(cam_id):
+        raise HTTPException(status_code=404, detail="Camera thread not active")
+
+    return StreamingResponse(
+        preview_broadcasters[cam_id].frames(),
+        media_type="multipart/x-mixed-replace; boundary=frame",
+        headers={"Cache-Control": "no-cache, no-store", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/cameras/{cam_id}/snapshot")
 def capture_snapshot(cam_id: str, request: Request):
     assert_internal(request)
@@ -796,4 +2204,69 @@ def health_check():
         "active_streams": active_streams,
         "active_hls": active_hls,
         "ocr_enabled": OCR_READER is not None,
+        "ocr_stats": dict(ocr_stats),
+        "detection_cache": detection_cache.stats(),
+        "ready": is_service_ready(),
+    }
+
+
+@app.get("/ready")
+def readiness_check():
+    payload = {
+        "model_loaded": model_ready.is_set(),
+        "ocr_loaded": ocr_ready.is_set(),
+        "ocr_enabled": OCR_READER is not None,
+        "model_version": active_model.version if active_model else None,
+        "using_custom_model": bool(active_model and active_model.using_custom_model),
+        "startup_timings": startup_timings,
+    }
+    if not wait_until_ready(timeout=0):
+        raise HTTPException(status_code=503, detail={"status": "starting", "error": startup_error, **payload})
+    return {"status": "ready", **payload}
+
+
+class ModelReloadRequest(BaseModel):
+    path: str
+    version: Optional[str] = None
+
+
+@app.get("/internal/model")
+def get_model_info(request: Request):
+    assert_internal(request)
+    with model_swap_lock:
+        reload_state = dict(model_reload_state)
+    return {
+        "active": active_model.describe() if active_model else None,
+        "previous": previous_model.describe() if previous_model else None,
+        "reload": reload_state,
     }
+
+
+@app.post("/internal/model/reload", status_code=202)
+def reload_model(body: ModelReloadRequest, request: Request):
+    assert_internal(request)
+    if not model_ready.is_set():
+        raise HTTPException(status_code=503, detail="Initial model is still loading")
+
+    model_path = resolve_model_path(body.path)
+    with model_swap_lock:
+        if model_reload_state["status"] == "loading":
+            raise HTTPException(status_code=409, detail=f"Reload of {model_reload_state['target']} already in progress")
+        model_reload_state.update({"status": "loading", "target": model_path, "error": None})
+
+    threading.Thread(target=reload_model_in_background, args=(model_path, body.version), daemon=True).start()
+    return {"status": "loading", "path": model_path}
+
+
+@app.post("/internal/model/rollback")
+def rollback_model(request: Request):
+    assert_internal(request)
+    with model_swap_lock:
+        # The reload would replace the rolled-back model as soon as it finishes.
+        if model_reload_state["status"] == "loading":
+            raise HTTPException(status_code=409, detail=f"Reload of {model_reload_state['target']} in progress")
+        if previous_model is None:
+            raise HTTPException(status_code=409, detail="No previous model version to roll back to")
+
+    swap_active_model(previous_model)
+    return {"status": "success", "active": active_model.describe() if active_model else None}
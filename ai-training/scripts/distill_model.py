@@ -0,0 +1,376 @@
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import torch
+import yaml
+from ultralytics import YOLO
+from ultralytics.nn.tasks import DetectionModel, yaml_model_load
+
+from prepare_dataset import IMAGE_SUFFIXES, place_file
+from validate_model import benchmark_cpu
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DATA_PATH = "/home/milan/Neon_Guardian/ai-training/datasets/data.yaml"
+DISTILLED_DIR = "/home/milan/Neon_Guardian/ai-training/datasets/distilled"
+PROJECT_DIR = "/home/milan/Neon_Guardian/ai-training/models/trained"
+REPORT_PATH = "/home/milan/Neon_Guardian/ai-training/logs/distillation_report.json"
+
+
+def read_yolo_labels(label_path):
+    if not label_path.exists():
+        return np.zeros((0, 5), dtype=np.float32)
+    rows = [line.split() for line in label_path.read_text().splitlines() if line.strip()]
+    return np.array(rows, dtype=np.float32).reshape(-1, 5)
+
+
+def xywh_iou(boxes_a, boxes_b):
+    """IoU between two sets of normalized cx, cy, w, h boxes."""
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros((len(boxes_a), len(boxes_b)), dtype=np.float32)
+
+    def corners(boxes):
+        return np.stack([
+            boxes[:, 0] - boxes[:, 2] / 2,
+            boxes[:, 1] - boxes[:, 3] / 2,
+            boxes[:, 0] + boxes[:, 2] / 2,
+            boxes[:, 1] + boxes[:, 3] / 2,
+        ], axis=1)
+
+    a = corners(boxes_a)[:, None, :]
+    b = corners(boxes_b)[None, :, :]
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-9)
+
+
+def build_distilled_dataset(teacher_path, data_path, out_dir, teacher_conf, merge_iou, imgsz, batch_size, link_mode):
+    """
+    Labels the training split with the teacher and merges its boxes into the
+    ground truth, so the student also learns the objects the teacher finds but
+    annotators missed. Validation and test splits stay on the original labels.
+    """
+    with open(data_path, "r") as f:
+        data = yaml.safe_load(f)
+
+    base_path = Path(data["path"])
+    train_images = base_path / data["train"]
+    train_labels = base_path / data["train"].replace("images", "labels", 1)
+    out_images = Path(out_dir) / "images" / "train"
+    out_labels = Path(out_dir) / "labels" / "train"
+    out_images.mkdir(parents=True, exist_ok=True)
+    out_labels.mkdir(parents=True, exist_ok=True)
+
+    image_paths = sorted(p for p in train_images.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    teacher = YOLO(teacher_path)
+    added = 0
+
+    for start in range(0, len(image_paths), batch_size):
+        chunk = image_paths[start:start + batch_size]
+        results = teacher.predict([str(p) for p in chunk], imgsz=imgsz, conf=teacher_conf, verbose=False)
+        for img_path, result in zip(chunk, results):
+            ground_truth = read_yolo_labels(train_labels / f"{img_path.stem}.txt")
+            teacher_boxes = result.boxes.xywhn.cpu().numpy()
+            teacher_classes = result.boxes.cls.cpu().numpy()
+
+            merged = [ground_truth]
+            if len(teacher_boxes):
+                overlap = xywh_iou(teacher_boxes, ground_truth[:, 1:])
+                same_class = teacher_classes[:, None] == ground_truth[None, :, 0]
+                covered = ((overlap >= merge_iou) & same_class).any(axis=1) if len(ground_truth) else np.zeros(len(teacher_boxes), dtype=bool)
+                extra = np.concatenate([teacher_classes[~covered, None], teacher_boxes[~covered]], axis=1)
+                merged.append(extra.astype(np.float32))
+                added += int((~covered).sum())
+
+            rows = np.concatenate(merged)
+            lines = [f"{int(row[0])} {row[1]:.6f} {row[2]:.6f} {row[3]:.6f} {row[4]:.6f}" for row in rows]
+            (out_labels / f"{img_path.stem}.txt").write_text("\n".join(lines) + ("\n" if lines else ""))
+            place_file(img_path, out_images / img_path.name, link_mode)
+
+    distilled_yaml = Path(out_dir) / "data.yaml"
+    distilled_data = dict(data)
+    distilled_data["path"] = str(out_dir)
+    distilled_data["train"] = "images/train"
+    # Absolute paths keep validation and test on the untouched ground truth.
+    distilled_data["val"] = str(base_path / data["val"])
+    if data.get("test"):
+        distilled_data["test"] = str(base_path / data["test"])
+    with open(distilled_yaml, "w") as f:
+        yaml.safe_dump(distilled_data, f, sort_keys=False)
+
+    logger.info(f"Distilled {len(image_paths)} training images; teacher added {added} boxes.")
+    return distilled_yaml
+
+
+def write_student_config(base_cfg, width_multiple, out_dir):
+    """
+    Writes a copy of the base architecture with fewer channels per layer. It
+    fixes the pruned shape; build_student then fills it with the filters kept
+    from the pretrained model, so both parameters and CPU FLOPs shrink.
+    """
+    cfg = yaml_model_load(base_cfg)
+    scale = cfg.get("scale") or "n"
+    depth_multiple, _, max_channels = cfg["scales"][scale]
+    cfg["scales"] = {scale: [depth_multiple, width_multiple, max_channels]}
+    cfg.pop("scale", None)
+    cfg.pop("yaml_file", None)
+
+    # Ultralytics reads the scale letter from the file name, so keep the base prefix.
+    stem = Path(base_cfg).stem
+    student_cfg = Path(out_dir) / f"{stem}-w{int(width_multiple * 1000)}.yaml"
+    student_cfg.parent.mkdir(parents=True, exist_ok=True)
+    with open(student_cfg, "w") as f:
+        yaml.safe_dump(cfg, f, sort_keys=False)
+    return student_cfg
+
+
+def select_filters(weight, in_idx, count, candidates=None):
+    """Indices of the `count` output filters with the largest L1 norm over the kept inputs."""
+    if candidates is None:
+        candidates = torch.arange(weight.shape[0])
+    if count > len(candidates):
+        raise ValueError(f"cannot keep {count} of {len(candidates)} filters")
+    scores = weight[candidates][:, in_idx].abs().sum(dim=(1, 2, 3))
+    return candidates[scores.argsort(descending=True)[:count]].sort().values
+
+
+def prune_conv(src, dst, in_idx, out_idx=None, candidates=None):
+    """Copies the kept filters of an ultralytics Conv (conv + bn) into its narrower twin."""
+    if src.conv.groups > 1:
+        # Depthwise: one filter per input channel, so the outputs follow the inputs.
+        out_idx = in_idx
+        dst.conv.weight.data.copy_(src.conv.weight.data[out_idx])
+    else:
+        if out_idx is None:
+            out_idx = select_filters(src.conv.weight.data, in_idx, dst.conv.out_channels, candidates)
+        dst.conv.weight.data.copy_(src.conv.weight.data[out_idx][:, in_idx])
+    for name in ("weight", "bias", "running_mean", "running_var"):
+        getattr(dst.bn, name).data.copy_(getattr(src.bn, name).data[out_idx])
+    return out_idx
+
+
+def prune_head_branch(src, dst, in_idx):
+    for src_layer, dst_layer in zip(src, dst):
+        name = type(src_layer).__name__
+        if name in ("Conv", "DWConv"):
+            in_idx = prune_conv(src_layer, dst_layer, in_idx)
+        elif isinstance(src_layer, torch.nn.Sequential):
+            in_idx = prune_head_branch(src_layer, dst_layer, in_idx)
+        elif isinstance(src_layer, torch.nn.Conv2d):
+            # Box and class outputs are kept whole; only their inputs are pruned.
+            dst_layer.weight.data.copy_(src_layer.weight.data[:, in_idx])
+            dst_layer.bias.data.copy_(src_layer.bias.data)
+            in_idx = torch.arange(src_layer.out_channels)
+        else:
+            raise ValueError(f"unsupported detect head layer {name}")
+    return in_idx
+
+
+def prune_into_student(source, student):
+    """
+    Structured pruning of a pretrained YOLOv8 model into a narrower copy of the
+    same architecture. Every conv keeps its top-k filters by L1 norm; the
+    matching BN entries and the next layers' input channels are sliced to fit,
+    following C2f splits, residual adds, SPPF and Concat so the kept channels
+    stay consistent across the graph.
+    """
+    src_layers, dst_layers = source.model, student.model
+    if len(src_layers) != len(dst_layers):
+        raise ValueError("source and student have a different number of layers")
+
+    kept = []  # per layer: indices of the source output channels the student keeps
+    widths = []  # per layer: number of source output channels
+    for i, (src, dst) in enumerate(zip(src_layers, dst_layers)):
+        name = type(src).__name__
+        if name != type(dst).__name__:
+            raise ValueError(f"layer {i} is {name} in the source but {type(dst).__name__} in the student")
+        sources = [src.f] if isinstance(src.f, int) else src.f
+        if i == 0:
+            inputs = [(torch.arange(3), 3)]  # the RGB input
+        else:
+            inputs = [(kept[j], widths[j]) for j in sources]
+        in_idx, in_width = inputs[0]
+
+        if name == "Conv":
+            out_idx, width = prune_conv(src, dst, in_idx), src.conv.out_channels
+        elif name == "C2f":
+            if len(src.m) != len(dst.m):
+                raise ValueError(f"layer {i} has a different number of bottlenecks")
+            c = src.c
+            first = select_filters(src.cv1.conv.weight.data, in_idx, dst.c, torch.arange(0, c))
+            second = select_filters(src.cv1.conv.weight.data, in_idx, dst.c, torch.arange(c, 2 * c))
+            prune_conv(src.cv1, dst.cv1, in_idx, torch.cat([first, second]))
+            pieces, current = [first, second], second - c
+            for j, (src_block, dst_block) in enumerate(zip(src.m, dst.m)):
+                hidden = prune_conv(src_block.cv1, dst_block.cv1, current)
+                # A residual add forces the block to keep exactly the channels it received.
+                current = prune_conv(src_block.cv2, dst_block.cv2, hidden, current if src_block.add else None)
+                pieces.append(current + (2 + j) * c)
+            out_idx, width = prune_conv(src.cv2, dst.cv2, torch.cat(pieces)), src.cv2.conv.out_channels
+        elif name == "SPPF":
+            hidden = prune_conv(src.cv1, dst.cv1, in_idx)
+            c = src.cv1.conv.out_channels
+            out_idx = prune_conv(src.cv2, dst.cv2, torch.cat([hidden + k * c for k in range(4)]))
+            width = src.cv2.conv.out_channels
+        elif name == "Upsample":
+            out_idx, width = in_idx, in_width
+        elif name == "Concat":
+            offsets = np.cumsum([0] + [w for _, w in inputs[:-1]])
+            out_idx = torch.cat([idx + int(offset) for (idx, _), offset in zip(inputs, offsets)])
+            width = sum(w for _, w in inputs)
+        elif name == "Detect":
+            for level, (level_idx, _) in enumerate(inputs):
+                prune_head_branch(src.cv2[level], dst.cv2[level], level_idx)
+                prune_head_branch(src.cv3[level], dst.cv3[level], level_idx)
+            dst.dfl.load_state_dict(src.dfl.state_dict())
+            out_idx, width = None, None
+        else:
+            raise ValueError(f"unsupported layer {name}")
+        kept.append(out_idx)
+        widths.append(width)
+
+
+def build_student(student_cfg, init_weights):
+    """
+    Builds a student for the given width and initialises it by structured
+    pruning of init_weights, then saves it as a checkpoint so training starts
+    from the pruned weights. Falls back to shape-matched transfer when the
+    source cannot be pruned into the student (e.g. a different architecture).
+    """
+    if not init_weights:
+        return YOLO(str(student_cfg)), {"weights": None, "method": "scratch", "pretrained": False}
+
+    source = YOLO(str(init_weights)).model.float().eval()
+    try:
+        student_model = DetectionModel(str(student_cfg), nc=len(source.names), verbose=False)
+        prune_into_student(source, student_model)
+    except (ValueError, RuntimeError, AttributeError, IndexError) as e:
+        logger.warning(f"Could not prune {init_weights} into {Path(student_cfg).name} ({e}); "
+                       f"transferring shape-matched tensors only.")
+        student = YOLO(str(student_cfg))
+        source_state = source.state_dict()
+        student_state = student.model.state_dict()
+        transferred = sum(1 for name, tensor in student_state.items()
+                          if name in source_state and source_state[name].shape == tensor.shape)
+        student.load(str(init_weights))
+        return student, {
+            "weights": str(init_weights),
+            "method": "shape-matched transfer",
+            "pretrained": transferred == len(student_state),
+            "transferred": transferred,
+            "total": len(student_state),
+        }
+
+    student_model.names = source.names
+    pruned_path = Path(student_cfg).with_suffix(".pt")
+    torch.save({"model": student_model, "train_args": {}}, pruned_path)
+    logger.info(f"Pruned {init_weights} into {pruned_path.name}: "
+                f"{sum(p.numel() for p in student_model.parameters())} of "
+                f"{sum(p.numel() for p in source.parameters())} parameters kept.")
+    return YOLO(str(pruned_path)), {
+        "weights": str(init_weights),
+        "method": "l1-filter-pruning",
+        "pretrained": True,
+        "pruned_checkpoint": str(pruned_path),
+    }
+
+
+def count_parameters(model_path):
+    return int(sum(p.numel() for p in YOLO(str(model_path)).model.parameters()))
+
+
+def evaluate(model_path, data_path, imgsz, benchmark_formats, batch_size):
+    metrics = YOLO(str(model_path)).val(data=data_path, imgsz=imgsz, verbose=False)
+    latency = benchmark_cpu(
+        str(model_path),
+        data_path,
+        formats=benchmark_formats,
+        batch_sizes=[batch_size],
+        image_sizes=[imgsz],
+    )
+    return {
+        "model": str(model_path),
+        "imgsz": imgsz,
+        "parameters": count_parameters(model_path),
+        "mAP50": metrics.box.map50,
+        "mAP50-95": metrics.box.map,
+        "cpu_benchmark": latency,
+    }
+
+
+def distill(config):
+    settings = config.get("distillation", {})
+    teacher_path = settings.get("teacher", f"{PROJECT_DIR}/traffic_model_v1.pt")
+    if not Path(teacher_path).exists():
+        logger.error(f"Teacher model {teacher_path} does not exist. Run training first.")
+        return
+
+    student_imgsz = settings.get("image_size", 416)
+    teacher_imgsz = config.get("image_size", 640)
+    benchmark_formats = settings.get("benchmark_formats", ["pt", "onnx"])
+    benchmark_batch = settings.get("benchmark_batch_size", 1)
+    project_name = f"{config.get('project_name', 'NeonGuardian_Traffic')}_distill"
+
+    distilled_yaml = build_distilled_dataset(
+        teacher_path,
+        DATA_PATH,
+        settings.get("dataset_dir", DISTILLED_DIR),
+        teacher_conf=settings.get("teacher_conf", 0.35),
+        merge_iou=settings.get("merge_iou", 0.5),
+        imgsz=teacher_imgsz,
+        batch_size=config.get("batch_size", 16),
+        link_mode=settings.get("link_mode", "hardlink"),
+    )
+
+    # "teacher" reuses the fine-tuned weights; otherwise start from the same checkpoint the teacher was fine-tuned from.
+    student_init = settings.get("student_init", config.get("model", "yolov8n.pt"))
+    if student_init == "teacher":
+        student_init = teacher_path
+
+    report = {
+        "teacher": evaluate(teacher_path, DATA_PATH, teacher_imgsz, benchmark_formats, benchmark_batch),
+        "students": [],
+    }
+
+    for width_multiple in settings.get("student_widths", [0.25, 0.1875]):
+        student_cfg = write_student_config(settings.get("student_base", "yolov8n.yaml"), width_multiple,
+                                           Path(PROJECT_DIR) / project_name / "configs")
+        logger.info(f"Training student {student_cfg.name} at imgsz={student_imgsz}")
+        student, init_info = build_student(student_cfg, student_init)
+        results = student.train(
+            data=str(distilled_yaml),
+            epochs=settings.get("epochs", config.get("epochs", 50)),
+            imgsz=student_imgsz,
+            batch=config.get("batch_size", 16),
+            device=config.get("device", "auto"),
+            project=PROJECT_DIR,
+            name=f"{project_name}_w{int(width_multiple * 1000)}",
+            save_period=config.get("save_period", 5),
+        )
+
+        best_model_path = Path(results.save_dir) / 'weights' / 'best.pt'
+        if not best_model_path.exists():
+            logger.warning(f"No best.pt produced for width {width_multiple}, skipping evaluation.")
+            continue
+
+        entry = evaluate(best_model_path, DATA_PATH, student_imgsz, benchmark_formats, benchmark_batch)
+        entry["width_multiple"] = width_multiple
+        entry["init"] = init_info
+        report["students"].append(entry)
+
+    Path(REPORT_PATH).parent.mkdir(parents=True, exist_ok=True)
+    with open(REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=4)
+    logger.info(f"Distillation report saved to {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    config_path = Path("/home/milan/Neon_Guardian/ai-training/configs/training_config.yaml")
+    with open(config_path, "r") as f:
+        distill(yaml.safe_load(f))
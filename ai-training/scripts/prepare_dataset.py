@@ -1,12 +1,88 @@
 import os
+import json
 import shutil
-import random
+import hashlib
+import argparse
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-def prepare_dataset(raw_dir, base_dir, split_ratio=(0.7, 0.2, 0.1)):
+IMAGE_SUFFIXES = ['.jpg', '.jpeg', '.png']
+SPLIT_NAMES = ('train', 'val', 'test')
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+FICLONE = 0x40049409  # Linux ioctl for copy-on-write file clones (btrfs, xfs)
+
+
+def assign_split(stem, split_ratio):
+    """
+    Deterministically maps a file stem to a split, so re-running never reshuffles
+    existing files and new files land in a stable split.
+    """
+    digest = hashlib.sha1(stem.encode('utf-8')).hexdigest()
+    bucket = int(digest[:8], 16) / 0xFFFFFFFF
+    if bucket < split_ratio[0]:
+        return 'train'
+    if bucket < split_ratio[0] + split_ratio[1]:
+        return 'val'
+    return 'test'
+
+
+def file_signature(path):
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def reflink_file(src, dst):
+    import fcntl
+
+    with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+        fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+    shutil.copystat(src, dst)
+
+
+def place_file(src, dst, mode):
+    """
+    Materializes src at dst using the requested mode, falling back to a plain
+    copy when the filesystem does not support links or clones.
+    """
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+
+    if mode == 'hardlink':
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    elif mode == 'reflink':
+        try:
+            reflink_file(src, dst)
+            return
+        except (OSError, ImportError):
+            if dst.exists():
+                dst.unlink()
+
+    shutil.copy2(src, dst)
+
+
+def load_manifest(manifest_path):
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def prepare_dataset(raw_dir, base_dir, split_ratio=(0.7, 0.2, 0.1), mode='copy', workers=8, force=False):
     """
     Splits raw images and labels into train, val, and test sets.
     Assumes raw_dir contains images and labels subfolders.
+
+    Splits are derived from a hash of each file stem and recorded in
+    base_dir/manifest.json; on later runs only new or changed pairs are placed
+    and pairs removed from raw_dir are pruned from the splits.
     """
     raw_path = Path(raw_dir)
     images_raw = raw_path / 'images'
@@ -16,54 +92,139 @@ def prepare_dataset(raw_dir, base_dir, split_ratio=(0.7, 0.2, 0.1)):
         print(f"Error: {images_raw} or {labels_raw} does not exist.")
         return
 
-    # Get all image files
-    image_files = [f for f in images_raw.iterdir() if f.suffix.lower() in ['.jpg', '.jpeg', '.png']]
-    
-    # Shuffle for random splitting
-    random.shuffle(image_files)
+    base_path = Path(base_dir)
+    manifest_path = base_path / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+    ratio_key = [round(r, 6) for r in split_ratio]
+    # The previous entries are still needed to prune files out of their old
+    # splits, even when nothing from the last run can be reused.
+    previous_entries = manifest.get('files', {})
+    reuse = not force
+    if manifest.get('split_ratio') not in (None, ratio_key):
+        print("Split ratio changed since the last run; re-placing every file.")
+        reuse = False
+    # Without a manifest (e.g. splits left by the old random-shuffle script) or with --force,
+    # nothing on disk is known, so every split directory is swept against the hashed splits.
+    sweep = force or not manifest
+
+    # One directory scan per side gives both the pairs and the orphans.
+    images = {f.stem: f for f in images_raw.iterdir() if f.suffix.lower() in IMAGE_SUFFIXES}
+    labels = {f.stem: f for f in labels_raw.iterdir() if f.suffix.lower() == '.txt'}
+    orphan_images = sorted(images.keys() - labels.keys())
+    orphan_labels = sorted(labels.keys() - images.keys())
 
-    num_images = len(image_files)
-    train_idx = int(num_images * split_ratio[0])
-    val_idx = train_idx + int(num_images * split_ratio[1])
+    for split_name in SPLIT_NAMES:
+        (base_path / 'images' / split_name).mkdir(parents=True, exist_ok=True)
+        (base_path / 'labels' / split_name).mkdir(parents=True, exist_ok=True)
 
-    splits = {
-        'train': image_files[:train_idx],
-        'val': image_files[train_idx:val_idx],
-        'test': image_files[val_idx:]
-    }
+    entries = {}
+    jobs = []
+    for stem in sorted(images.keys() & labels.keys()):
+        img_file = images[stem]
+        label_file = labels[stem]
+        split_name = assign_split(stem, split_ratio)
+        entry = {
+            'split': split_name,
+            'image': img_file.name,
+            'image_sig': file_signature(img_file),
+            'label_sig': file_signature(label_file),
+        }
+        entries[stem] = entry
 
-    base_path = Path(base_dir)
+        img_dest = base_path / 'images' / split_name / img_file.name
+        lbl_dest = base_path / 'labels' / split_name / label_file.name
+        if reuse and previous_entries.get(stem) == entry and img_dest.exists() and lbl_dest.exists():
+            continue
+
+        stale = previous_entries.get(stem)
+        if stale and (stale['split'] != split_name or stale['image'] != img_file.name):
+            jobs.append(('remove', stale))
+        jobs.append(('place', (img_file, img_dest, label_file, lbl_dest)))
+
+    for stem, stale in previous_entries.items():
+        if stem not in entries:
+            jobs.append(('remove', stale))
 
-    for split_name, files in splits.items():
-        img_dest = base_path / 'images' / split_name
-        lbl_dest = base_path / 'labels' / split_name
-        
-        img_dest.mkdir(parents=True, exist_ok=True)
-        lbl_dest.mkdir(parents=True, exist_ok=True)
-
-        print(f"Processing {split_name} split ({len(files)} images)...")
-
-        for img_file in files:
-            # Check for corresponding label
-            label_file = labels_raw / f"{img_file.stem}.txt"
-            
-            if label_file.exists():
-                # Copy image
-                shutil.copy2(img_file, img_dest / img_file.name)
-                # Copy label
-                shutil.copy2(label_file, lbl_dest / label_file.name)
-            else:
-                print(f"Warning: No label found for {img_file.name}, skipping.")
+    if sweep:
+        for split_name in SPLIT_NAMES:
+            for kind in ('images', 'labels'):
+                for existing in (base_path / kind / split_name).iterdir():
+                    entry = entries.get(existing.stem)
+                    expected_name = entry and (entry['image'] if kind == 'images' else f"{existing.stem}.txt")
+                    if not existing.is_file() or (entry and entry['split'] == split_name and existing.name == expected_name):
+                        continue
+                    jobs.append(('sweep', existing))
+
+    def run_job(job):
+        kind, payload = job
+        if kind == 'sweep':
+            payload.unlink(missing_ok=True)
+            return kind
+        if kind == 'remove':
+            stale_image = base_path / 'images' / payload['split'] / payload['image']
+            stale_label = base_path / 'labels' / payload['split'] / f"{Path(payload['image']).stem}.txt"
+            for stale_path in (stale_image, stale_label):
+                if stale_path.exists():
+                    stale_path.unlink()
+            return kind
+        img_file, img_dest, label_file, lbl_dest = payload
+        place_file(img_file, img_dest, mode)
+        place_file(label_file, lbl_dest, mode)
+        return kind
+
+    # Removals run before placements so a file moving between splits is not deleted after it lands.
+    removals = [job for job in jobs if job[0] in ('remove', 'sweep')]
+    placements = [job for job in jobs if job[0] == 'place']
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(run_job, removals))
+        list(pool.map(run_job, placements))
+
+    counts = {split_name: 0 for split_name in SPLIT_NAMES}
+    for entry in entries.values():
+        counts[entry['split']] += 1
+
+    base_path.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, 'w') as f:
+        json.dump({
+            'version': MANIFEST_VERSION,
+            'split_ratio': ratio_key,
+            'files': entries,
+        }, f, indent=2)
+
+    print(f"Splits: train={counts['train']} val={counts['val']} test={counts['test']}")
+    swept = sum(1 for job in removals if job[0] == 'sweep')
+    print(f"Placed {len(placements)} new or changed pairs ({mode}), "
+          f"pruned {len(removals) - swept} stale pairs, {len(entries) - len(placements)} unchanged.")
+    if swept:
+        print(f"Removed {swept} files from the split directories that do not belong to their hashed split.")
+    orphan_report = base_path / 'orphans.json'
+    if orphan_images or orphan_labels:
+        print(f"Skipped {len(orphan_images)} images without labels and {len(orphan_labels)} labels without images.")
+        with open(orphan_report, 'w') as f:
+            json.dump({'images_without_labels': orphan_images, 'labels_without_images': orphan_labels}, f, indent=2)
+        print(f"Orphan list written to {orphan_report}")
+    elif orphan_report.exists():
+        orphan_report.unlink()
 
     print("Dataset preparation complete.")
 
+
 if __name__ == "__main__":
     RAW_DATA_DIR = "/home/milan/Neon_Guardian/ai-training/datasets/raw"
     BASE_DATA_DIR = "/home/milan/Neon_Guardian/ai-training/datasets"
-    
+
+    parser = argparse.ArgumentParser(description="Split raw images and labels into train/val/test.")
+    parser.add_argument('--raw-dir', default=RAW_DATA_DIR)
+    parser.add_argument('--base-dir', default=BASE_DATA_DIR)
+    parser.add_argument('--mode', choices=['copy', 'hardlink', 'reflink'], default='copy',
+                        help="How files are placed into the splits (falls back to copy if unsupported).")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--force', action='store_true', help="Re-place every file and remove anything in the split directories that does not belong there.")
+    args = parser.parse_args()
+
     # Ensure directories exist
-    Path(RAW_DATA_DIR).mkdir(parents=True, exist_ok=True)
-    (Path(RAW_DATA_DIR) / 'images').mkdir(exist_ok=True)
-    (Path(RAW_DATA_DIR) / 'labels').mkdir(exist_ok=True)
+    Path(args.raw_dir).mkdir(parents=True, exist_ok=True)
+    (Path(args.raw_dir) / 'images').mkdir(exist_ok=True)
+    (Path(args.raw_dir) / 'labels').mkdir(exist_ok=True)
 
-    prepare_dataset(RAW_DATA_DIR, BASE_DATA_DIR)
+    prepare_dataset(args.raw_dir, args.base_dir, mode=args.mode, workers=args.workers, force=args.force)
@@ -1,38 +1,157 @@
 from ultralytics import YOLO
 import cv2
-import os
+import json
+import time
+import queue
+import argparse
+import threading
+import numpy as np
+from collections import Counter
 from pathlib import Path
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def test_inference():
-    model_path = "/home/milan/Neon_Guardian/ai-training/models/trained/traffic_model_v1.pt"
+MODEL_PATH = "/home/milan/Neon_Guardian/ai-training/models/trained/traffic_model_v1.pt"
+TEST_IMAGES_DIR = "/home/milan/Neon_Guardian/ai-training/datasets/images/test"
+OUTPUT_DIR = "/home/milan/Neon_Guardian/ai-training/logs/inference_results"
+
+_END = object()
+
+
+def image_loader(image_paths, batch_size, out_queue):
+    """
+    Decodes images on a background thread and hands them over in batches so the
+    model never waits on disk reads.
+    """
+    batch = []
+    for img_path in image_paths:
+        frame = cv2.imread(str(img_path))
+        if frame is None:
+            logger.warning(f"Could not read {img_path.name}, skipping.")
+            continue
+        batch.append((img_path, frame))
+        if len(batch) >= batch_size:
+            out_queue.put(batch)
+            batch = []
+    if batch:
+        out_queue.put(batch)
+    out_queue.put(_END)
+
+
+def annotation_writer(in_queue, output_dir):
+    while True:
+        item = in_queue.get()
+        if item is _END:
+            return
+        img_path, result = item
+        cv2.imwrite(str(output_dir / img_path.name), result.plot())
+
+
+def test_inference(args):
+    model_path = args.model
     if not Path(model_path).exists():
         logger.error("No trained model found.")
         return
 
     model = YOLO(model_path)
-    
-    test_images_dir = Path("/home/milan/Neon_Guardian/ai-training/datasets/images/test")
-    output_dir = Path("/home/milan/Neon_Guardian/ai-training/logs/inference_results")
+
+    test_images_dir = Path(args.images)
+    output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     if not test_images_dir.exists():
         logger.error("Test images directory not found.")
         return
 
-    test_images = list(test_images_dir.glob("*.jpg")) + list(test_images_dir.glob("*.png"))
-    
+    test_images = sorted(list(test_images_dir.glob("*.jpg")) + list(test_images_dir.glob("*.png")))
+
     if not test_images:
         logger.warning("No test images found to run inference.")
         return
 
-    for img_path in test_images[:5]: # Test on first 5
-        logger.info(f"Running inference on {img_path.name}...")
-        results = model.predict(source=str(img_path), save=True, project=str(output_dir), name="run")
-        logger.info(f"Results saved to {output_dir}")
+    batches = queue.Queue(maxsize=args.prefetch)
+    loader = threading.Thread(target=image_loader, args=(test_images, args.batch_size, batches), daemon=True)
+    loader.start()
+
+    writes = None
+    writer = None
+    if args.save:
+        writes = queue.Queue(maxsize=args.batch_size * 4)
+        writer = threading.Thread(target=annotation_writer, args=(writes, output_dir), daemon=True)
+        writer.start()
+
+    class_counts = Counter()
+    batch_latencies = []
+    images_done = 0
+    run_start = time.perf_counter()
+
+    while True:
+        batch = batches.get()
+        if batch is _END:
+            break
+
+        paths = [img_path for img_path, _ in batch]
+        frames = [frame for _, frame in batch]
+        start = time.perf_counter()
+        results = model.predict(frames, imgsz=args.imgsz, conf=args.conf, device=args.device, verbose=False)
+        batch_latencies.append((time.perf_counter() - start, len(frames)))
+
+        for img_path, result in zip(paths, results):
+            names = result.names
+            for class_id in result.boxes.cls.tolist():
+                class_counts[names.get(int(class_id), str(int(class_id)))] += 1
+            if writes is not None:
+                writes.put((img_path, result))
+
+        images_done += len(frames)
+        if images_done % (args.batch_size * 20) < len(frames):
+            logger.info(f"Processed {images_done}/{len(test_images)} images...")
+
+    if writer is not None:
+        writes.put(_END)
+        writer.join()
+
+    wall_seconds = time.perf_counter() - run_start
+    per_image_ms = np.array([latency / count * 1000 for latency, count in batch_latencies]) if batch_latencies else np.zeros(1)
+    summary = {
+        "images": images_done,
+        "batch_size": args.batch_size,
+        "imgsz": args.imgsz,
+        "wall_seconds": round(wall_seconds, 2),
+        "images_per_second": round(images_done / wall_seconds, 2) if wall_seconds > 0 else None,
+        "per_image_latency_ms": {
+            "p50": round(float(np.percentile(per_image_ms, 50)), 2),
+            "p95": round(float(np.percentile(per_image_ms, 95)), 2),
+            "p99": round(float(np.percentile(per_image_ms, 99)), 2),
+        },
+        "detections_per_class": dict(class_counts.most_common()),
+    }
+
+    summary_path = output_dir / "inference_summary.json"
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=4)
+
+    logger.info(f"Processed {images_done} images at {summary['images_per_second']} img/s")
+    logger.info(f"Per-image latency (ms): {summary['per_image_latency_ms']}")
+    logger.info(f"Detections per class: {summary['detections_per_class']}")
+    logger.info(f"Summary saved to {summary_path}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run batched inference over the whole test split.")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--images", default=TEST_IMAGES_DIR)
+    parser.add_argument("--output", default=OUTPUT_DIR)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--prefetch", type=int, default=4, help="Number of batches the loader may read ahead.")
+    parser.add_argument("--save", action="store_true", help="Write annotated images to the output directory.")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    test_inference()
+    test_inference(parse_args())
@@ -16,6 +16,11 @@ def train():
 
     logger.info(f"Starting training with config: {config}")
 
+    if config.get("mode") == "distill":
+        from distill_model import distill
+        distill(config)
+        return
+
     # Load model
     model_name = config.get("model", "yolov8n.pt")
     model = YOLO(model_name)
@@ -1,4 +1,11 @@
 import json
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+import yaml
+import cv2
 from ultralytics import YOLO
 from pathlib import Path
 import logging
@@ -6,9 +13,117 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def validate():
+MODEL_PATH = "/home/milan/Neon_Guardian/ai-training/models/trained/traffic_model_v1.pt"
+DATA_PATH = "/home/milan/Neon_Guardian/ai-training/datasets/data.yaml"
+REPORT_PATH = "/home/milan/Neon_Guardian/ai-training/logs/validation_report.json"
+
+# Formats whose exported graph has a fixed batch dimension and must be exported per batch size.
+STATIC_BATCH_FORMATS = {'torchscript'}
+
+
+def load_sample_frames(data_path, count):
+    """
+    Loads up to `count` validation images to benchmark on, padding with noise
+    frames when the split is smaller than the largest batch.
+    """
+    frames = []
+    try:
+        with open(data_path, "r") as f:
+            data = yaml.safe_load(f)
+        val_dir = Path(data.get("path", "")) / data.get("val", "images/val")
+        for img_path in sorted(val_dir.glob("*"))[:count * 4]:
+            frame = cv2.imread(str(img_path))
+            if frame is not None:
+                frames.append(frame)
+            if len(frames) >= count:
+                break
+    except (OSError, yaml.YAMLError) as e:
+        logger.warning(f"Could not read validation images for benchmarking: {e}")
+
+    rng = np.random.default_rng(0)
+    while len(frames) < count:
+        frames.append(rng.integers(0, 255, size=(720, 1280, 3), dtype=np.uint8))
+    return frames
+
+
+def percentile_ms(samples, q):
+    return round(float(np.percentile(samples, q)) * 1000, 2)
+
+
+def time_predictions(model, frames, batch_size, imgsz, warmup, iterations):
+    batch = frames[:batch_size]
+    for _ in range(warmup):
+        model.predict(batch, imgsz=imgsz, device="cpu", verbose=False)
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        model.predict(batch, imgsz=imgsz, device="cpu", verbose=False)
+        samples.append(time.perf_counter() - start)
+
+    total = sum(samples)
+    return {
+        "batch_latency_ms": {
+            "p50": percentile_ms(samples, 50),
+            "p95": percentile_ms(samples, 95),
+            "p99": percentile_ms(samples, 99),
+        },
+        "per_image_p50_ms": round(percentile_ms(samples, 50) / batch_size, 2),
+        "images_per_second": round(batch_size * iterations / total, 2) if total > 0 else None,
+    }
+
+
+def export_for_benchmark(model_path, fmt, imgsz, batch_size):
+    if fmt == 'pt':
+        return model_path
+    kwargs = {"format": fmt, "imgsz": imgsz}
+    if fmt in STATIC_BATCH_FORMATS:
+        kwargs["batch"] = batch_size
+    else:
+        kwargs["dynamic"] = True
+    return YOLO(model_path).export(**kwargs)
+
+
+def benchmark_cpu(model_path, data_path, formats, batch_sizes, image_sizes, warmup=3, iterations=20, frame_budget_ms=None):
+    """
+    Measures end-to-end CPU predict latency (pre-process, forward, NMS) for every
+    format / image size / batch size combination.
+
+    Exports are made from a scratch copy of the model, so the deployment artifacts
+    next to model_path (e.g. from export_model.py) are never overwritten.
+    """
+    frames = load_sample_frames(data_path, max(batch_sizes))
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as scratch_dir:
+        scratch_model = Path(scratch_dir) / Path(model_path).name
+        shutil.copy2(model_path, scratch_model)
+
+        for fmt in formats:
+            for imgsz in image_sizes:
+                model = None
+                for batch_size in batch_sizes:
+                    entry = {"format": fmt, "imgsz": imgsz, "batch_size": batch_size}
+                    try:
+                        if model is None or fmt in STATIC_BATCH_FORMATS:
+                            exported = export_for_benchmark(str(scratch_model), fmt, imgsz, batch_size)
+                            model = YOLO(str(exported), task="detect")
+                        entry.update(time_predictions(model, frames, batch_size, imgsz, warmup, iterations))
+                        if frame_budget_ms is not None:
+                            entry["meets_frame_budget"] = entry["per_image_p50_ms"] <= frame_budget_ms
+                        logger.info(f"{fmt} imgsz={imgsz} batch={batch_size}: "
+                                    f"p50={entry['batch_latency_ms']['p50']}ms, {entry['images_per_second']} img/s")
+                    except Exception as e:
+                        logger.warning(f"Benchmark failed for {fmt} imgsz={imgsz} batch={batch_size}: {e}")
+                        entry["error"] = str(e)
+                    results.append(entry)
+
+    return results
+
+
+def validate(args):
     # Load the trained model
-    model_path = "/home/milan/Neon_Guardian/ai-training/models/trained/traffic_model_v1.pt"
+    model_path = args.model
     if not Path(model_path).exists():
         logger.error(f"Model path {model_path} does not exist. Run training first.")
         return
@@ -16,8 +131,8 @@ def validate():
     model = YOLO(model_path)
 
     # Validate the model
-    metrics = model.val(data="/home/milan/Neon_Guardian/ai-training/datasets/data.yaml")
-    
+    metrics = model.val(data=args.data)
+
     # Extract results
     report = {
         "mAP50": metrics.box.map50,
@@ -27,13 +142,48 @@ def validate():
         "fitness": metrics.fitness
     }
 
+    if not args.skip_benchmark:
+        report["cpu_benchmark"] = {
+            "warmup": args.warmup,
+            "iterations": args.iterations,
+            "frame_budget_ms": args.frame_budget_ms,
+            "results": benchmark_cpu(
+                model_path,
+                args.data,
+                formats=args.formats,
+                batch_sizes=args.batch_sizes,
+                image_sizes=args.image_sizes,
+                warmup=args.warmup,
+                iterations=args.iterations,
+                frame_budget_ms=args.frame_budget_ms,
+            ),
+        }
+
     # Save report
-    report_path = "/home/milan/Neon_Guardian/ai-training/logs/validation_report.json"
+    report_path = args.report
+    Path(report_path).parent.mkdir(parents=True, exist_ok=True)
     with open(report_path, "w") as f:
         json.dump(report, f, indent=4)
 
     logger.info(f"Validation report saved to {report_path}")
     logger.info(f"mAP50: {report['mAP50']}")
 
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Validate the trained model and benchmark CPU inference.")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--report", default=REPORT_PATH)
+    parser.add_argument("--formats", nargs="+", default=["pt", "onnx", "torchscript"])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 4, 8])
+    parser.add_argument("--image-sizes", nargs="+", type=int, default=[320, 480, 640])
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--frame-budget-ms", type=float, default=None,
+                        help="Per-frame CPU budget; each result is flagged with whether it fits.")
+    parser.add_argument("--skip-benchmark", action="store_true")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    validate()
+    validate(parse_args())
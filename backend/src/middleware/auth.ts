@@ -21,6 +21,11 @@ export const authenticateToken = async (req: AuthRequest, res: Response, next: N
     try {
         const decoded = jwt.verify(token, JWT_SECRET) as any;
 
+        // Stream tokens only open media URLs; they are never valid as session tokens.
+        if (decoded.scope) {
+            return res.status(403).json({ error: 'Invalid token.' });
+        }
+
         // Check if user still exists and is active
         const user = await prisma.user.findUnique({ where: { id: decoded.id } });
         if (!user) {
@@ -43,6 +48,54 @@ export const authenticateToken = async (req: AuthRequest, res: Response, next: N
     }
 };
 
+const STREAM_TOKEN_SCOPE = 'live-preview';
+const STREAM_TOKEN_TTL_SECONDS = Number(process.env.STREAM_TOKEN_TTL_SECONDS || 60);
+
+/**
+ * Signs a short-lived token for one camera's preview stream. Media elements such as
+ * <img src> cannot send an Authorization header, so the token travels in the query string.
+ */
+export const signStreamToken = (userId: string, cameraId: string) => {
+    const token = jwt.sign(
+        { sub: userId, scope: STREAM_TOKEN_SCOPE, cameraId },
+        JWT_SECRET,
+        { expiresIn: STREAM_TOKEN_TTL_SECONDS }
+    );
+    return { token, expiresIn: STREAM_TOKEN_TTL_SECONDS };
+};
+
+export const authenticateStreamToken = async (req: AuthRequest, res: Response, next: NextFunction): Promise<any> => {
+    const token = typeof req.query.token === 'string' ? req.query.token : undefined;
+
+    if (!token) return res.status(401).json({ error: 'Access denied. No token provided.' });
+
+    try {
+        const decoded = jwt.verify(token, JWT_SECRET) as any;
+        if (decoded.scope !== STREAM_TOKEN_SCOPE || decoded.cameraId !== req.params.cameraId) {
+            return res.status(403).json({ error: 'Invalid token.' });
+        }
+
+        const user = await prisma.user.findUnique({ where: { id: decoded.sub } });
+        if (!user) {
+            return res.status(401).json({ error: 'User no longer exists.' });
+        }
+        if (!user.isActive) {
+            return res.status(403).json({ error: 'Account is disabled. Contact administrator.' });
+        }
+
+        req.user = {
+            id: user.id,
+            role: user.role,
+            clearanceLevel: user.clearanceLevel,
+            isActive: user.isActive
+        };
+
+        next();
+    } catch (error) {
+        res.status(403).json({ error: 'Invalid token.' });
+    }
+};
+
 export const requireRole = (roles: string[]) => {
     return async (req: AuthRequest, res: Response, next: NextFunction): Promise<any> => {
         if (!req.user || !roles.includes(req.user.role.toUpperCase())) {
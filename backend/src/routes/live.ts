@@ -1,6 +1,6 @@
 import { Router, Request, Response } from 'express';
 import axios from 'axios';
-import { authenticateToken } from '../middleware/auth';
+import { authenticateToken, authenticateStreamToken, signStreamToken, AuthRequest } from '../middleware/auth';
 
 const router = Router();
 const AI_SERVICE_URL = process.env.AI_SERVICE_URL || 'http://ai-service:8000';
@@ -66,4 +66,40 @@ router.post('/:cameraId/snapshot', authenticateToken, async (req: Request, res:
     }
 });
 
+/**
+ * POST /api/live/:cameraId/preview/token
+ * Issues a short-lived, camera-bound token so an <img> can open the MJPEG preview.
+ */
+router.post('/:cameraId/preview/token', authenticateToken, async (req: AuthRequest, res: Response): Promise<any> => {
+    const { cameraId } = req.params;
+    const { token, expiresIn } = signStreamToken(req.user!.id, cameraId);
+    res.json({
+        previewUrl: `/api/live/${cameraId}/preview?token=${encodeURIComponent(token)}`,
+        expiresIn
+    });
+});
+
+/**
+ * GET /api/live/:cameraId/preview?token=...
+ * Proxies the AI service's low-latency MJPEG preview (annotated frames, reduced size/fps).
+ * Authenticated with a token from POST /:cameraId/preview/token, since <img> sends no headers.
+ */
+router.get('/:cameraId/preview', authenticateStreamToken, async (req: Request, res: Response): Promise<any> => {
+    try {
+        const { cameraId } = req.params;
+        const upstream = await axios.get(`${AI_SERVICE_URL}/cameras/${cameraId}/preview.mjpg`, {
+            headers: aiHeaders,
+            responseType: 'stream'
+        });
+
+        res.setHeader('Content-Type', upstream.headers['content-type'] || 'multipart/x-mixed-replace; boundary=frame');
+        res.setHeader('Cache-Control', 'no-cache, no-store');
+        req.on('close', () => upstream.data.destroy());
+        upstream.data.pipe(res);
+    } catch (error: any) {
+        console.error(`Failed to open live preview for ${req.params.cameraId}:`, error.message);
+        res.status(502).json({ error: 'Failed to open AI live preview' });
+    }
+});
+
 export default router;
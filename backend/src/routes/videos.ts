@@ -206,116 +206,182 @@ router.patch('/:id/status', authenticateInternal, async (req: Request, res: Resp
     }
 });
 
-// POST /api/videos/:id/violations - Add a violation detected in a video
-router.post('/:id/violations', authenticateInternal, async (req: Request, res: Response): Promise<any> => {
-    try {
-        const id = req.params.id as string;
-        const { violationType, confidenceScore, frameTimestamp, plateNumber, boundingBox, evidenceImagePath, dedupKey } = req.body;
-        const normalizedType = normalizeViolationType(violationType);
-        const normalizedPlate = normalizePlateNumber(plateNumber);
-        const parsedFrameTimestamp = parseFloat(frameTimestamp);
-        const parsedConfidence = parseFloat(confidenceScore);
-        const parsedBoundingBox = boundingBox ? (typeof boundingBox === 'string' ? JSON.parse(boundingBox) : boundingBox) : null;
-        const parsedDedupKey = typeof dedupKey === 'string' ? dedupKey.slice(0, 128) : null;
-
-        if (!normalizedType || Number.isNaN(parsedFrameTimestamp) || Number.isNaN(parsedConfidence)) {
-            return res.status(400).json({ error: 'Invalid violation payload' });
-        }
-
-        const duplicateWhere: any = {
-            videoId: id,
-            violationType: normalizedType,
-            frameTimestamp: {
-                gte: parsedFrameTimestamp - VIDEO_DUPLICATE_WINDOW_SECONDS,
-                lte: parsedFrameTimestamp + VIDEO_DUPLICATE_WINDOW_SECONDS
-            }
-        };
-        if (normalizedPlate) {
-            duplicateWhere.plateNumber = normalizedPlate;
-        } else if (parsedDedupKey) {
-            duplicateWhere.dedupKey = parsedDedupKey;
-        }
-
-        const duplicate = await prisma.videoViolation.findFirst({
-            where: duplicateWhere,
-            orderBy: { createdAt: 'desc' }
-        });
-
-        if (duplicate) {
-            return res.status(200).json({
-                duplicate: true,
-                violationId: duplicate.id
-            });
-        }
-
-        // Ensure vehicle row exists before creating VideoViolation (FK on plateNumber).
-        let vehicle = null;
-        if (normalizedPlate) {
-            vehicle = await updateOrCreateVehicle(prisma, normalizedPlate);
-        }
-
-        const violation = await prisma.videoViolation.create({
-            data: {
-                videoId: id,
-                violationType: normalizedType,
-                confidenceScore: parsedConfidence,
-                frameTimestamp: parsedFrameTimestamp,
-                videoTimestampSeconds: req.body.videoTimestampSeconds ? parseFloat(req.body.videoTimestampSeconds) : parsedFrameTimestamp,
-                plateNumber: normalizedPlate,
-                boundingBox: parsedBoundingBox,
-                dedupKey: parsedDedupKey,
-                evidenceImagePath,
-                evidenceVideoPath: req.body.evidenceVideoPath || null
-            }
-        });
-
-        // Feature 2: Automatic Fine Calculation
-        const fineAmount = await calculateFine(prisma, normalizedType, vehicle?.totalViolations || 0);
+// PATCH /api/videos/:id/progress - Relay processing progress to the uploader
+router.patch('/:id/progress', authenticateInternal, async (req: Request, res: Response): Promise<any> => {
+    try {
+        const id = req.params.id as string;
+        const { framesProcessed, totalFrames, percent, etaSeconds } = req.body;
 
-        // Update violation with fine info
-        await prisma.videoViolation.update({
-            where: { id: violation.id },
-            data: {
-                fineAmount,
-                fineStatus: 'pending',
-                fineGeneratedAt: new Date()
-            }
-        });
+        const video = await prisma.uploadedVideo.findUnique({ where: { id } });
+        if (!video) {
+            return res.status(404).json({ error: 'Video not found' });
+        }
 
-        // Notify frontend
-        const enrichedViolation = await prisma.videoViolation.findUnique({
-            where: { id: violation.id },
-            include: { vehicle: true }
+        await publishJson('video:progress', {
+            videoId: id,
+            framesProcessed: Number(framesProcessed) || 0,
+            totalFrames: Number(totalFrames) || 0,
+            percent: percent === null || percent === undefined ? null : Number(percent),
+            etaSeconds: etaSeconds === null || etaSeconds === undefined ? null : Number(etaSeconds),
+            userId: video.uploadedBy
         });
 
-        const videoRecord = await prisma.uploadedVideo.findUnique({ where: { id } });
-        await publishJson('video:violation', {
-            videoId: id,
-            violation: enrichedViolation,
-            userId: videoRecord?.uploadedBy
-        });
-
-        // Emit fine generated event
-        await publishJson('fine:generated', {
-            violationId: violation.id,
-            fineAmount,
-            plateNumber: normalizedPlate
-        });
-
-        await updateMetric('violations_today', 1);
-        await updateMetric('violations_hour', 1);
-        if (fineAmount > 0) {
-            await updateMetric('fines_today', fineAmount);
-        }
-        if (vehicle && vehicle.totalViolations > 1) {
-            await updateMetric('repeat_offenders_today', 1);
-        }
-
-        res.status(201).json(enrichedViolation);
+        res.json({ status: 'ok' });
+    } catch (error) {
+        res.status(500).json({ error: 'Failed to relay video progress' });
+    }
+});
+
+type VideoViolationResult = { status: number; body: any };
+
+// Shared by the single and bulk endpoints so both apply the same validation and dedup rules.
+const createVideoViolation = async (id: string, input: any): Promise<VideoViolationResult> => {
+    const { violationType, confidenceScore, frameTimestamp, plateNumber, boundingBox, evidenceImagePath, dedupKey, modelVersion } = input;
+    const normalizedType = normalizeViolationType(violationType);
+    const normalizedPlate = normalizePlateNumber(plateNumber);
+    const parsedFrameTimestamp = parseFloat(frameTimestamp);
+    const parsedConfidence = parseFloat(confidenceScore);
+    const parsedBoundingBox = boundingBox ? (typeof boundingBox === 'string' ? JSON.parse(boundingBox) : boundingBox) : null;
+    const parsedDedupKey = typeof dedupKey === 'string' ? dedupKey.slice(0, 128) : null;
+    const parsedModelVersion = typeof modelVersion === 'string' && modelVersion ? modelVersion.slice(0, 128) : null;
+
+    if (!normalizedType || Number.isNaN(parsedFrameTimestamp) || Number.isNaN(parsedConfidence)) {
+        return { status: 400, body: { error: 'Invalid violation payload' } };
+    }
+
+    const duplicateWhere: any = {
+        videoId: id,
+        violationType: normalizedType,
+        frameTimestamp: {
+            gte: parsedFrameTimestamp - VIDEO_DUPLICATE_WINDOW_SECONDS,
+            lte: parsedFrameTimestamp + VIDEO_DUPLICATE_WINDOW_SECONDS
+        }
+    };
+    if (normalizedPlate) {
+        duplicateWhere.plateNumber = normalizedPlate;
+    } else if (parsedDedupKey) {
+        duplicateWhere.dedupKey = parsedDedupKey;
+    }
+
+    const duplicate = await prisma.videoViolation.findFirst({
+        where: duplicateWhere,
+        orderBy: { createdAt: 'desc' }
+    });
+
+    if (duplicate) {
+        return {
+            status: 200,
+            body: {
+                duplicate: true,
+                violationId: duplicate.id
+            }
+        };
+    }
+
+    // Ensure vehicle row exists before creating VideoViolation (FK on plateNumber).
+    let vehicle = null;
+    if (normalizedPlate) {
+        vehicle = await updateOrCreateVehicle(prisma, normalizedPlate);
+    }
+
+    const violation = await prisma.videoViolation.create({
+        data: {
+            videoId: id,
+            violationType: normalizedType,
+            confidenceScore: parsedConfidence,
+            frameTimestamp: parsedFrameTimestamp,
+            videoTimestampSeconds: input.videoTimestampSeconds ? parseFloat(input.videoTimestampSeconds) : parsedFrameTimestamp,
+            plateNumber: normalizedPlate,
+            boundingBox: parsedBoundingBox,
+            dedupKey: parsedDedupKey,
+            modelVersion: parsedModelVersion,
+            evidenceImagePath,
+            evidenceVideoPath: input.evidenceVideoPath || null
+        }
+    });
+
+    // Feature 2: Automatic Fine Calculation
+    const fineAmount = await calculateFine(prisma, normalizedType, vehicle?.totalViolations || 0);
+
+    // Update violation with fine info
+    await prisma.videoViolation.update({
+        where: { id: violation.id },
+        data: {
+            fineAmount,
+            fineStatus: 'pending',
+            fineGeneratedAt: new Date()
+        }
+    });
+
+    // Notify frontend
+    const enrichedViolation = await prisma.videoViolation.findUnique({
+        where: { id: violation.id },
+        include: { vehicle: true }
+    });
+
+    const videoRecord = await prisma.uploadedVideo.findUnique({ where: { id } });
+    await publishJson('video:violation', {
+        videoId: id,
+        violation: enrichedViolation,
+        userId: videoRecord?.uploadedBy
+    });
+
+    // Emit fine generated event
+    await publishJson('fine:generated', {
+        violationId: violation.id,
+        fineAmount,
+        plateNumber: normalizedPlate
+    });
+
+    await updateMetric('violations_today', 1);
+    await updateMetric('violations_hour', 1);
+    if (fineAmount > 0) {
+        await updateMetric('fines_today', fineAmount);
+    }
+    if (vehicle && vehicle.totalViolations > 1) {
+        await updateMetric('repeat_offenders_today', 1);
+    }
+
+    return { status: 201, body: enrichedViolation };
+};
+
+// POST /api/videos/:id/violations - Add a violation detected in a video
+router.post('/:id/violations', authenticateInternal, async (req: Request, res: Response): Promise<any> => {
+    try {
+        const result = await createVideoViolation(req.params.id as string, req.body);
+        res.status(result.status).json(result.body);
     } catch (error) {
         console.error('Error creating video violation:', error);
         res.status(500).json({ error: 'Failed to create video violation' });
     }
 });
 
+// POST /api/videos/:id/violations/bulk - Add a batch of violations detected in a video
+router.post('/:id/violations/bulk', authenticateInternal, async (req: Request, res: Response): Promise<any> => {
+    const id = req.params.id as string;
+    const { violations } = req.body;
+
+    if (!Array.isArray(violations)) {
+        return res.status(400).json({ error: 'Expected a violations array' });
+    }
+
+    // Items are applied in order so dedup windows and repeat-offender counts match single posts.
+    const results: VideoViolationResult[] = [];
+    for (const item of violations) {
+        try {
+            results.push(await createVideoViolation(id, item));
+        } catch (error) {
+            console.error('Error creating video violation in bulk:', error);
+            results.push({ status: 500, body: { error: 'Failed to create video violation' } });
+        }
+    }
+
+    res.json({
+        created: results.filter((result) => result.status === 201).length,
+        duplicates: results.filter((result) => result.status === 200).length,
+        failed: results.filter((result) => result.status >= 400).length,
+        results
+    });
+});
+
 export default router;
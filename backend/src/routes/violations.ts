@@ -179,7 +179,8 @@ router.post('/', authenticateInternal, upload.single('evidenceImage'), async (re
             locationLng,
             videoTimestampSeconds,
             boundingBox,
-            dedupKey
+            dedupKey,
+            modelVersion
         } = req.body;
 
         const resolvedType = normalizeViolationType(type || violationType);
@@ -191,6 +192,7 @@ router.post('/', authenticateInternal, upload.single('evidenceImage'), async (re
         const parsedLocationLng = locationLng ? Number(locationLng) : null;
         const parsedBoundingBox = boundingBox ? (typeof boundingBox === 'string' ? JSON.parse(boundingBox) : boundingBox) : null;
         const parsedDedupKey = typeof dedupKey === 'string' ? dedupKey.slice(0, 128) : null;
+        const parsedModelVersion = typeof modelVersion === 'string' && modelVersion ? modelVersion.slice(0, 128) : null;
 
         if (!resolvedType || !cameraId || Number.isNaN(resolvedConfidence)) {
             return res.status(400).json({ error: 'Missing required fields: type, cameraId, confidenceScore' });
@@ -253,6 +255,7 @@ router.post('/', authenticateInternal, upload.single('evidenceImage'), async (re
                 videoTimestampSeconds: parsedVideoTimestamp,
                 boundingBox: parsedBoundingBox,
                 dedupKey: parsedDedupKey,
+                modelVersion: parsedModelVersion,
                 reviewStatus: 'UNDER_REVIEW'
             },
             include: { camera: true }
@@ -52,6 +52,7 @@ export const initRedisSubscriber = async () => {
         'fine:generated',
         'metrics:update',
         'video:status',
+        'video:progress',
         'video:violation',
         'system:update_available'
     ];
@@ -8,7 +8,8 @@ import {
     Camera as CameraIcon,
     AlertTriangle,
     CheckCircle,
-    XCircle
+    XCircle,
+    Zap
 } from 'lucide-react';
 import { socket } from '../socket';
 
@@ -25,6 +26,8 @@ export const CameraViewer: React.FC = () => {
     const [showOverlay, setShowOverlay] = useState(false);
     const [snapshotStatus, setSnapshotStatus] = useState<'idle' | 'capturing' | 'success' | 'error'>('idle');
     const [snapshotUrl, setSnapshotUrl] = useState<string | null>(null);
+    const [lowLatency, setLowLatency] = useState(false);
+    const [previewUrl, setPreviewUrl] = useState<string | null>(null);
 
     useEffect(() => {
         const fetchCamera = async () => {
@@ -43,6 +46,29 @@ export const CameraViewer: React.FC = () => {
 
         fetchCamera();
 
+        // Listen for live violations on this camera
+        const handleViolation = (violation: any) => {
+            if (violation.cameraId === id) {
+                setLiveViolations(prev => [violation, ...prev].slice(0, 5));
+                setLastViolation(violation);
+                setShowOverlay(true);
+                // Hide overlay after 5 seconds
+                setTimeout(() => setShowOverlay(false), 5000);
+            }
+        };
+
+        socket.on('violation:new', handleViolation);
+
+        return () => {
+            socket.off('violation:new', handleViolation);
+        };
+    }, [id]);
+
+    // The HLS encoder only runs while this viewer is on the HLS player; the low-latency
+    // preview reads frames from the camera thread directly.
+    useEffect(() => {
+        if (lowLatency) return;
+
         // Start Streaming on AI Service
         const startStream = async () => {
             try {
@@ -59,19 +85,6 @@ export const CameraViewer: React.FC = () => {
 
         startStream();
 
-        // Listen for live violations on this camera
-        const handleViolation = (violation: any) => {
-            if (violation.cameraId === id) {
-                setLiveViolations(prev => [violation, ...prev].slice(0, 5));
-                setLastViolation(violation);
-                setShowOverlay(true);
-                // Hide overlay after 5 seconds
-                setTimeout(() => setShowOverlay(false), 5000);
-            }
-        };
-
-        socket.on('violation:new', handleViolation);
-
         return () => {
             // Stop Streaming on AI Service
             const stopStream = async () => {
@@ -81,12 +94,11 @@ export const CameraViewer: React.FC = () => {
                 }).catch(e => console.error(e));
             };
             stopStream();
-            socket.off('violation:new', handleViolation);
         };
-    }, [id]);
+    }, [apiUrl, id, lowLatency]);
 
     useEffect(() => {
-        if (isStreaming && videoRef.current) {
+        if (isStreaming && !lowLatency && videoRef.current) {
             const hlsUrl = `${backendBaseUrl}/uploads/live/${id}/index.m3u8`;
             const video = videoRef.current;
 
@@ -125,7 +137,36 @@ export const CameraViewer: React.FC = () => {
                 video.src = hlsUrl;
             }
         }
-    }, [backendBaseUrl, isStreaming, id]);
+    }, [backendBaseUrl, isStreaming, lowLatency, id]);
+
+    // The MJPEG preview is an <img>, which cannot send the bearer header; fetch a short-lived stream token instead.
+    useEffect(() => {
+        if (!isStreaming || !lowLatency) {
+            setPreviewUrl(null);
+            return;
+        }
+
+        let cancelled = false;
+        const openPreview = async () => {
+            try {
+                const res = await fetch(`${apiUrl}/live/${id}/preview/token`, {
+                    method: 'POST',
+                    headers: { Authorization: `Bearer ${localStorage.getItem('token')}` }
+                });
+                if (!res.ok) throw new Error(`Preview token request failed (${res.status})`);
+                const data = await res.json();
+                if (!cancelled) setPreviewUrl(`${backendBaseUrl}${data.previewUrl}`);
+            } catch (err) {
+                console.error("Failed to open low-latency preview", err);
+                if (!cancelled) setLowLatency(false);
+            }
+        };
+
+        openPreview();
+        return () => {
+            cancelled = true;
+        };
+    }, [apiUrl, backendBaseUrl, isStreaming, lowLatency, id]);
 
     const takeSnapshot = async () => {
         setSnapshotStatus('capturing');
@@ -185,6 +226,17 @@ export const CameraViewer: React.FC = () => {
                         <div className="text-[10px] text-slate-500 uppercase">Stability</div>
                         <div className="text-sm font-bold text-primary">{camera.uptimePercentage || 100}%</div>
                     </div>
+                    <button
+                        onClick={() => setLowLatency(prev => !prev)}
+                        disabled={!isStreaming}
+                        className={`flex items-center gap-2 px-4 py-2 rounded transition-all text-sm font-bold uppercase tracking-widest ${lowLatency
+                                ? 'bg-primary text-black'
+                                : 'bg-primary/10 border border-primary/30 text-primary hover:bg-primary/20'
+                            }`}
+                    >
+                        <Zap className="w-4 h-4" />
+                        {lowLatency ? 'Low Latency' : 'HLS'}
+                    </button>
                     <button
                         onClick={takeSnapshot}
                         disabled={snapshotStatus === 'capturing' || !isStreaming}
@@ -211,6 +263,15 @@ export const CameraViewer: React.FC = () => {
                                 <div className="text-xl font-bold uppercase tracking-widest">{error}</div>
                                 <button onClick={() => window.location.reload()} className="px-4 py-2 border border-red-500/50 rounded hover:bg-red-500/10 uppercase text-xs">Reconnect</button>
                             </div>
+                        ) : lowLatency ? (
+                            previewUrl && (
+                                <img
+                                    src={previewUrl}
+                                    alt="Low-latency preview"
+                                    className="w-full h-full object-cover"
+                                    onError={() => setLowLatency(false)}
+                                />
+                            )
                         ) : (
                             <video
                                 ref={videoRef}